@@ -1,8 +1,14 @@
+import os
 import time
+import tempfile
 import random
 import statistics
+import tracemalloc
+from itertools import islice
+from array import array
 from typing import List, Callable, Dict, Tuple
-from smart_sort import SmartSort
+from smart_sort import (SmartSort, ParallelSmartSort, ExternalSmartSort, SortedAccumulator,
+                        InputCharacteristics, SampledCharacteristics, SORTING_NETWORKS)
 
 
 class SortingBenchmark:
@@ -39,6 +45,11 @@ class SortingBenchmark:
         elif data_type == "sparse_range":
             return [random.randint(1, size * 100) for _ in range(size)]
         
+        elif data_type == "append_mostly":
+            data = list(range(size))
+            data.extend(random.randint(0, size) for _ in range(max(1, size // 50)))
+            return data
+        
         elif data_type == "alternating":
             return [i if i % 2 == 0 else size - i for i in range(size)]
         
@@ -147,6 +158,7 @@ class SortingBenchmark:
             (1000, "sorted"),
             (1000, "reverse"),
             (1000, "sparse_range"),
+            (1000, "append_mostly"),
         ]
         
         all_results = []
@@ -190,6 +202,473 @@ class SortingBenchmark:
         print(f"Win rate: {(smart_sort_wins/total_tests)*100:.1f}%")
         print(f"{'='*70}")
     
+    def benchmark_presortedness(self, sizes: Tuple[int, ...] = (1000, 10000, 100000),
+                                runs: int = 3):
+        print("\n" + "="*70)
+        print("PRESORTEDNESS ANALYSIS COST")
+        print("="*70)
+        
+        for size in sizes:
+            print(f"\nSize: {size}")
+            for data_type in ("random", "nearly_sorted", "reverse"):
+                data = self.generate_test_data(size, data_type)
+                line = f"  {data_type:15s}"
+                for mode in InputCharacteristics.PRESORTEDNESS_MODES:
+                    times = []
+                    for _ in range(runs):
+                        start = time.perf_counter()
+                        chars = InputCharacteristics(data, mode)
+                        chars.presortedness
+                        times.append(time.perf_counter() - start)
+                    line += (f" {mode}: {min(times)*1000:9.3f} ms "
+                             f"(score {chars.presortedness:.3f})")
+                print(line)
+    
+    def benchmark_sampled_analysis(self, sizes: Tuple[int, ...] = (10000, 100000, 1000000),
+                                   budget: int = SampledCharacteristics.DEFAULT_BUDGET):
+        print("\n" + "="*70)
+        print(f"SAMPLED ANALYSIS COST (budget={budget})")
+        print("="*70)
+        
+        for size in sizes:
+            data = self.generate_test_data(size, "random")
+            
+            start = time.perf_counter()
+            chars = SampledCharacteristics(data, budget=budget)
+            chars.presortedness
+            chars.unique_estimate
+            chars.range_density
+            analysis_time = time.perf_counter() - start
+            
+            start = time.perf_counter()
+            sorted(data)
+            sort_time = time.perf_counter() - start
+            
+            print(f"  n={size:8d}: analysis {analysis_time*1000:8.3f} ms, "
+                  f"sorted() {sort_time*1000:8.3f} ms, "
+                  f"presortedness {chars.presortedness:.3f}±{chars.presortedness_error:.3f}, "
+                  f"unique~{chars.unique_estimate}")
+    
+    def _legacy_feature_scan(self, data: List[int]):
+        min_val, max_val = min(data), max(data)
+        density = len(set(data)) / (max_val - min_val + 1)
+        unique_values = len(set(data))
+        sorted_data = sorted(data)
+        quartiles = (sorted_data[len(data) // 4], sorted_data[len(data) // 2],
+                     sorted_data[3 * len(data) // 4])
+        has_duplicates = len(data) != len(set(data))
+        return density, unique_values, quartiles, has_duplicates, (min(data), max(data))
+    
+    def _fused_feature_scan(self, data: List[int]):
+        chars = InputCharacteristics(data)
+        chars._scan_order()
+        chars._scan_values()
+        return (chars.range_density, chars.unique_estimate, chars._quartiles(),
+                chars.has_duplicates, chars.data_range)
+    
+    def _measure_analysis(self, func: Callable, data: List[int], runs: int) -> Tuple[float, int]:
+        times = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            func(data)
+            times.append(time.perf_counter() - start)
+        
+        tracemalloc.start()
+        func(data)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return min(times), peak
+    
+    def benchmark_feature_extraction(self, sizes: Tuple[int, ...] = (10000, 100000, 1000000),
+                                     runs: int = 3):
+        print("\n" + "="*70)
+        print("FEATURE EXTRACTION: LEGACY SCANS vs FUSED PASS")
+        print("="*70)
+        
+        for size in sizes:
+            for data_type in ("random", "dense_range", "sparse_range"):
+                data = self.generate_test_data(size, data_type)
+                legacy_time, legacy_peak = self._measure_analysis(self._legacy_feature_scan, data, runs)
+                fused_time, fused_peak = self._measure_analysis(self._fused_feature_scan, data, runs)
+                print(f"  n={size:8d} {data_type:13s} "
+                      f"legacy {legacy_time*1000:9.3f} ms / {legacy_peak/1024:9.1f} KiB   "
+                      f"fused {fused_time*1000:9.3f} ms / {fused_peak/1024:9.1f} KiB")
+    
+    def benchmark_merge_engine(self, sizes: Tuple[int, ...] = (10000, 100000), runs: int = 3):
+        print("\n" + "="*70)
+        print("BOTTOM-UP MERGE ENGINE THROUGHPUT")
+        print("="*70)
+        
+        sorter = SmartSort(verbose=False)
+        for size in sizes:
+            for data_type in ("random", "sparse_range"):
+                data = self.generate_test_data(size, data_type)
+                times = []
+                for _ in range(runs):
+                    data_copy = data.copy()
+                    start = time.perf_counter()
+                    sorter._merge_sort(data_copy, 0, size)
+                    times.append(time.perf_counter() - start)
+                
+                best = min(times)
+                print(f"  n={size:8d} {data_type:13s} {best*1000:9.3f} ms "
+                      f"({size / best / 1e6:6.3f} M elements/s)")
+    
+    def benchmark_buffer_memory(self, size: int = 200000):
+        print("\n" + "="*70)
+        print("TYPED BUFFER vs LIST: PEAK MEMORY")
+        print("="*70)
+        
+        for data_type in ("random", "sparse_range", "dense_range"):
+            source = array("q", self.generate_test_data(size, data_type))
+            sorter = SmartSort(verbose=False)
+            
+            tracemalloc.start()
+            sorter.sort(source.tolist())
+            _, list_peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            
+            tracemalloc.start()
+            sorter.sort_buffer(source)
+            _, buffer_peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            
+            print(f"  {data_type:13s} list {list_peak / size:7.1f} B/elem   "
+                  f"array('q') {buffer_peak / size:7.1f} B/elem")
+    
+    def benchmark_stats_modes(self, size: int = 20000, runs: int = 3):
+        print("\n" + "="*70)
+        print("STATISTICS COLLECTION OVERHEAD")
+        print("="*70)
+        
+        for data_type in ("random", "nearly_sorted", "sparse_range"):
+            data = self.generate_test_data(size, data_type)
+            timings = {}
+            for mode in SmartSort.STATS_MODES:
+                sorter = SmartSort(verbose=False, collect_stats=mode)
+                times = []
+                for _ in range(runs):
+                    start = time.perf_counter()
+                    sorter.sort(data)
+                    times.append(time.perf_counter() - start)
+                timings[mode] = min(times)
+            
+            baseline = timings["off"]
+            print(f"\n{data_type} (n={size}):")
+            for mode, best in timings.items():
+                print(f"  {mode:9s} {best*1000:9.3f} ms  ({best / baseline:5.2f}x)")
+    
+    def benchmark_parallel_scaling(self, size: int = 1000000, max_workers: int = None,
+                                   runs: int = 3):
+        print("\n" + "="*70)
+        print("PARALLEL SCALING")
+        print("="*70)
+        
+        max_workers = max_workers or os.cpu_count() or 1
+        for data_type in ("random", "sparse_range"):
+            data = self.generate_test_data(size, data_type)
+            print(f"\n{data_type} (n={size}):")
+            
+            baseline = None
+            for workers in range(1, max_workers + 1):
+                sorter = ParallelSmartSort(workers=workers, collect_stats="off")
+                times = []
+                for _ in range(runs):
+                    start = time.perf_counter()
+                    sorter.sort(data)
+                    times.append(time.perf_counter() - start)
+                
+                best = min(times)
+                baseline = baseline or best
+                print(f"  workers={workers:3d} {best*1000:10.3f} ms  "
+                      f"speedup {baseline / best:5.2f}x  efficiency {baseline / best / workers:5.2f}")
+    
+    def benchmark_external_sort(self, size: int = 1000000,
+                                budgets: Tuple[int, ...] = (1 << 20, 1 << 22, 1 << 24)):
+        print("\n" + "="*70)
+        print("EXTERNAL SORT THROUGHPUT")
+        print("="*70)
+        
+        with tempfile.TemporaryDirectory() as workdir:
+            input_path = os.path.join(workdir, "input.bin")
+            output_path = os.path.join(workdir, "output.bin")
+            for data_type in ("random", "sparse_range"):
+                with open(input_path, "wb") as stream:
+                    array("q", self.generate_test_data(size, data_type)).tofile(stream)
+                
+                print(f"\n{data_type} (n={size}, {size * 8 / 2**20:.1f} MiB):")
+                for budget in budgets:
+                    sorter = ExternalSmartSort(memory_budget=budget, collect_stats="off")
+                    start = time.perf_counter()
+                    sorter.sort_file(input_path, output_path)
+                    elapsed = time.perf_counter() - start
+                    
+                    stats = sorter.get_stats()
+                    print(f"  budget {budget / 2**20:6.1f} MiB: runs={stats['runs']:4d} "
+                          f"passes={stats['merge_passes']} {elapsed:8.3f} s "
+                          f"({size * 8 / elapsed / 2**20:6.2f} MiB/s)")
+    
+    def benchmark_selection(self, size: int = 200000, ks: Tuple[int, ...] = (10, 100, 1000, 10000)):
+        print("\n" + "="*70)
+        print("TOP-K AND SELECTION vs FULL SORT")
+        print("="*70)
+        
+        sorter = SmartSort(verbose=False, collect_stats="off")
+        for data_type in ("random", "sparse_range", "dense_range"):
+            data = self.generate_test_data(size, data_type)
+            start = time.perf_counter()
+            sorter.sort(data)
+            full = time.perf_counter() - start
+            print(f"\n{data_type} (n={size}): full sort {full*1000:9.3f} ms")
+            
+            for k in ks:
+                start = time.perf_counter()
+                sorter.topk(data, k)
+                elapsed = time.perf_counter() - start
+                print(f"  topk k={k:6d}   {elapsed*1000:9.3f} ms  ({full / elapsed:6.1f}x faster)")
+            
+            start = time.perf_counter()
+            sorter.select(data, size // 2)
+            elapsed = time.perf_counter() - start
+            print(f"  median select  {elapsed*1000:9.3f} ms  ({full / elapsed:6.1f}x faster)")
+    
+    def benchmark_lazy_iteration(self, size: int = 200000, pages: Tuple[int, ...] = (1, 10, 100),
+                                 page_size: int = 50):
+        print("\n" + "="*70)
+        print("LAZY SORTED ITERATION vs FULL SORT")
+        print("="*70)
+        
+        sorter = SmartSort(verbose=False, collect_stats="off")
+        for data_type in ("random", "sparse_range"):
+            data = self.generate_test_data(size, data_type)
+            start = time.perf_counter()
+            sorter.sort(data)
+            full = time.perf_counter() - start
+            print(f"\n{data_type} (n={size}): full sort {full*1000:9.3f} ms")
+            
+            for page_count in pages:
+                start = time.perf_counter()
+                for _ in islice(sorter.iter_sorted(data), page_count * page_size):
+                    pass
+                elapsed = time.perf_counter() - start
+                print(f"  first {page_count:4d} page(s) {elapsed*1000:9.3f} ms  "
+                      f"({full / elapsed:6.1f}x faster)")
+    
+    def benchmark_streaming_ingestion(self, size: int = 50000, snapshots: int = 20):
+        print("\n" + "="*70)
+        print("STREAMING INGESTION: ACCUMULATOR vs RE-SORT")
+        print("="*70)
+        
+        data = self.generate_test_data(size, "random")
+        step = size // snapshots
+        sorter = SmartSort(verbose=False, collect_stats="off")
+        
+        start = time.perf_counter()
+        received = []
+        for i in range(0, size, step):
+            received.extend(data[i:i + step])
+            sorter.sort(received)
+        resort = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        accumulator = SortedAccumulator(sorter)
+        for i in range(0, size, step):
+            for value in data[i:i + step]:
+                accumulator.add(value)
+            accumulator.rank(0)
+        streaming = time.perf_counter() - start
+        
+        print(f"  n={size}, {snapshots} sorted snapshots")
+        print(f"  re-sort on every snapshot {resort*1000:10.3f} ms")
+        print(f"  SortedAccumulator         {streaming*1000:10.3f} ms  ({resort / streaming:5.1f}x faster)")
+    
+    def benchmark_delta_resort(self, size: int = 200000,
+                               deltas: Tuple[int, ...] = (10, 100, 1000, 10000)):
+        print("\n" + "="*70)
+        print("DELTA RE-SORT vs FULL SORT")
+        print("="*70)
+        
+        sorter = SmartSort(verbose=False, collect_stats="off")
+        base = sorter.sort(self.generate_test_data(size, "random"))
+        for delta in deltas:
+            inserts = [random.randint(1, size * 10) for _ in range(delta)]
+            deletes = random.sample(base, delta)
+            
+            start = time.perf_counter()
+            updated = list(base)
+            for value in deletes:
+                updated.remove(value)
+            sorter.sort(updated + inserts)
+            full = time.perf_counter() - start
+            
+            start = time.perf_counter()
+            sorter.resort(base, inserts, deletes)
+            elapsed = time.perf_counter() - start
+            print(f"  d={delta:6d}  full sort {full*1000:10.3f} ms  resort {elapsed*1000:9.3f} ms  "
+                  f"({full / elapsed:6.1f}x faster)")
+    
+    def benchmark_kway_merge(self, total: int = 200000, shard_counts: Tuple[int, ...] = (2, 8, 64, 256)):
+        print("\n" + "="*70)
+        print("K-WAY MERGE vs CONCATENATE + SORT")
+        print("="*70)
+        
+        sorter = SmartSort(verbose=False, collect_stats="off")
+        data = self.generate_test_data(total, "random")
+        for count in shard_counts:
+            width = total // count
+            shards = [sorter.sort(data[start:start + width]) for start in range(0, total, width)]
+            
+            start = time.perf_counter()
+            sorter.sort([value for shard in shards for value in shard])
+            concatenated = time.perf_counter() - start
+            
+            start = time.perf_counter()
+            sorter.merge_sorted(shards, collect=True)
+            merged = time.perf_counter() - start
+            
+            start = time.perf_counter()
+            for _ in sorter.merge_sorted(shards):
+                pass
+            streamed = time.perf_counter() - start
+            print(f"  k={count:4d}  concat+sort {concatenated*1000:9.3f} ms  "
+                  f"merge_sorted {merged*1000:9.3f} ms  ({concatenated / merged:5.1f}x faster)  "
+                  f"streamed {streamed*1000:9.3f} ms")
+    
+    def benchmark_cost_model(self, size: int = 5000, runs: int = 3):
+        print("\n" + "="*70)
+        print("COST MODEL vs THRESHOLD RULES")
+        print("="*70)
+        
+        selectors = {mode: SmartSort(verbose=False, collect_stats="off", selection=mode)
+                     for mode in SmartSort.SELECTION_MODES}
+        for data_type in ("random", "nearly_sorted", "append_mostly", "dense_range",
+                          "sparse_range", "few_unique", "alternating"):
+            data = self.generate_test_data(size, data_type)
+            print(f"\n{data_type}:")
+            for mode, sorter in selectors.items():
+                times = []
+                for _ in range(runs):
+                    start = time.perf_counter()
+                    sorter.sort(data)
+                    times.append(time.perf_counter() - start)
+                
+                stats = sorter.get_stats()
+                strategy = stats["strategy_switches"][0]["strategy"]
+                print(f"  {mode:6s} {strategy:17s} {min(times)*1000:9.3f} ms  "
+                      f"predicted {stats['predicted_time']*1000:9.3f} ms  "
+                      f"actual kernel {stats['actual_time']*1000:9.3f} ms")
+    
+    def benchmark_segment_adaptation(self, size: int = 60000, runs: int = 3):
+        print("\n" + "="*70)
+        print("PER-SEGMENT RE-ADAPTATION vs ONE STRATEGY")
+        print("="*70)
+        
+        third = size // 3
+        pieces = {
+            "sorted": lambda count: list(range(count)),
+            "dense": lambda count: [random.randint(0, 500) for _ in range(count)],
+            "random": lambda count: [random.randint(0, 10 ** 12) for _ in range(count)],
+            "reversed": lambda count: list(range(count, 0, -1))
+        }
+        layouts = [("sorted", "dense", "random"), ("random", "sorted", "sorted"),
+                   ("dense", "reversed", "dense"), ("random", "random", "random")]
+        
+        segmented = SmartSort(verbose=False, collect_stats="off")
+        single = SmartSort(verbose=False, collect_stats="off")
+        single.SEGMENT_ANALYSIS_FACTOR = 0
+        for layout in layouts:
+            random.seed(size)
+            data = [value for name in layout for value in pieces[name](third)]
+            print(f"\n{' + '.join(layout)}:")
+            for label, sorter in (("segmented", segmented), ("single", single)):
+                times = []
+                for _ in range(runs):
+                    start = time.perf_counter()
+                    sorter.sort(data)
+                    times.append(time.perf_counter() - start)
+                
+                stats = sorter.get_stats()
+                segments = stats["strategy_switches"][1:] or stats["strategy_switches"]
+                plan = ", ".join(f"{event['strategy']}{list(event['range'])}" for event in segments)
+                print(f"  {label:9s} {min(times)*1000:9.3f} ms  analysed {stats['analyzed_elements']:7d}  {plan}")
+    
+    def benchmark_insertion_bound(self, sizes: List[int] = [2000, 8000, 32000]):
+        print("\n" + "="*70)
+        print("ADVERSARIAL INPUTS: INSERTION SORT SHIFT BUDGET")
+        print("="*70)
+        
+        def noisy_ramp(size):
+            return [i + random.randint(0, 9 * size // 10) for i in range(size)]
+        
+        def small_tail(size):
+            return list(range(size // 5, size)) + list(range(size // 5))
+        
+        def far_displaced(size):
+            return [size - i if i % 10 == 0 else i for i in range(size)]
+        
+        cases = [("noisy ramp", noisy_ramp, {"selection": "rules"}),
+                 ("small tail", small_tail, {"presortedness_mode": "runs"}),
+                 ("every 10th displaced", far_displaced,
+                  {"selection": "rules", "presortedness_mode": "runs"})]
+        
+        for name, generate, options in cases:
+            print(f"\n{name} ({', '.join(f'{k}={v}' for k, v in options.items())}):")
+            sorter = SmartSort(verbose=False, collect_stats="trace", **options)
+            for size in sizes:
+                random.seed(size)
+                data = generate(size)
+                inversions = (1 - InputCharacteristics(data).presortedness) * size * (size - 1) / 2
+                
+                start = time.perf_counter()
+                result = sorter.sort(data)
+                elapsed = time.perf_counter() - start
+                assert result == sorted(data)
+                
+                stats = sorter.get_stats()
+                budget = sorter.INSERTION_SHIFT_FACTOR * size * size.bit_length()
+                shifts = sum(event["swaps"] for event in stats["trace"]
+                             if event["kernel"] == "insertion")
+                plan = " -> ".join(event["strategy"] for event in stats["strategy_switches"])
+                print(f"  n={size:6d}: {elapsed*1000:9.2f} ms  shifts {shifts:9d} / budget {budget:9d}  "
+                      f"unbounded {inversions:13,.0f}  {plan}")
+    
+    def benchmark_leaf_kernels(self, leaves: int = 2000, runs: int = 5):
+        print("\n" + "="*70)
+        print("BASE-CASE KERNELS: PER-LEAF COST")
+        print("="*70)
+        
+        sorter = SmartSort(verbose=False, collect_stats="off")
+        kernels = {
+            "insertion": sorter._insertion_sort,
+            "binary": lambda data, left, right: sorter._binary_insertion_sort(data, left, right, left + 1),
+            "selected": sorter._small_sort
+        }
+        
+        print(f"\n{'size':>6}" + "".join(f"{name:>14}" for name in kernels) +
+              f"{'speedup':>10}  kernel")
+        for size in [2, 3, 4] + list(SORTING_NETWORKS) + [12, 16, 20, 24, 32]:
+            random.seed(size)
+            data = [random.randint(0, 10 ** 9) for _ in range(size * leaves)]
+            row = {}
+            for name, kernel in kernels.items():
+                times = []
+                for _ in range(runs):
+                    copy = data.copy()
+                    start = time.perf_counter()
+                    for left in range(0, len(copy), size):
+                        kernel(copy, left, left + size)
+                    times.append(time.perf_counter() - start)
+                row[name] = min(times) / leaves
+            
+            if size < SmartSort.NETWORK_MIN_SIZE:
+                selected = "insertion"
+            elif size <= SmartSort.NETWORK_MAX_SIZE:
+                selected = "network"
+            else:
+                selected = "binary insertion"
+            print(f"{size:6d}" + "".join(f"{row[name]*1e9:11.0f} ns" for name in kernels) +
+                  f"{row['insertion'] / row['selected']:9.2f}x  {selected}")
+    
     def analyze_strategy_selection(self):
         print("\n" + "="*70)
         print("STRATEGY SELECTION ANALYSIS")
@@ -238,6 +717,57 @@ def main():
     
     print("\n\n2. Performance Comparison")
     benchmark.run_comprehensive_benchmark()
+    
+    print("\n\n3. Presortedness Analysis Cost")
+    benchmark.benchmark_presortedness()
+    
+    print("\n\n4. Sampled Analysis Cost")
+    benchmark.benchmark_sampled_analysis()
+    
+    print("\n\n5. Feature Extraction")
+    benchmark.benchmark_feature_extraction()
+    
+    print("\n\n6. Merge Engine Throughput")
+    benchmark.benchmark_merge_engine()
+    
+    print("\n\n7. Typed Buffer Memory")
+    benchmark.benchmark_buffer_memory()
+    
+    print("\n\n8. Statistics Collection Overhead")
+    benchmark.benchmark_stats_modes()
+    
+    print("\n\n9. Parallel Scaling")
+    benchmark.benchmark_parallel_scaling()
+    
+    print("\n\n10. External Sort Throughput")
+    benchmark.benchmark_external_sort()
+    
+    print("\n\n11. Top-k and Selection")
+    benchmark.benchmark_selection()
+    
+    print("\n\n12. Lazy Sorted Iteration")
+    benchmark.benchmark_lazy_iteration()
+    
+    print("\n\n13. Streaming Ingestion")
+    benchmark.benchmark_streaming_ingestion()
+    
+    print("\n\n14. Delta Re-sort")
+    benchmark.benchmark_delta_resort()
+    
+    print("\n\n15. K-way Merge")
+    benchmark.benchmark_kway_merge()
+    
+    print("\n\n16. Cost Model Selection")
+    benchmark.benchmark_cost_model()
+    
+    print("\n\n17. Per-Segment Re-Adaptation")
+    benchmark.benchmark_segment_adaptation()
+    
+    print("\n\n18. Insertion Sort Shift Budget")
+    benchmark.benchmark_insertion_bound()
+    
+    print("\n\n19. Base-Case Kernels")
+    benchmark.benchmark_leaf_kernels()
 
 
 if __name__ == "__main__":
@@ -1,8 +1,115 @@
+import os
+import json
 import time
 import math
-from typing import List, Tuple, Dict, Any
+import heapq
+import shutil
+import operator
+import tempfile
+from bisect import bisect_left, bisect_right, insort
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from itertools import accumulate, chain, compress, count, islice, repeat
+from typing import List, Tuple, Dict, Any, Optional, Callable
 from enum import Enum
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+BUFFER_FORMATS = "bBhHiIlLqQ"
+
+SORTING_NETWORKS = {
+    5: ((0, 3), (1, 4), (0, 2), (1, 3), (0, 1), (2, 4), (1, 2), (3, 4), (2, 3)),
+    6: ((0, 5), (1, 3), (2, 4), (1, 2), (3, 4), (0, 3), (2, 5), (0, 1), (2, 3), (4, 5),
+        (1, 2), (3, 4)),
+    7: ((0, 6), (2, 3), (4, 5), (0, 2), (1, 4), (3, 6), (0, 1), (2, 5), (3, 4), (1, 2),
+        (4, 6), (2, 3), (4, 5), (1, 2), (3, 4), (5, 6)),
+    8: ((0, 2), (1, 3), (4, 6), (5, 7), (0, 4), (1, 5), (2, 6), (3, 7), (0, 1), (2, 3),
+        (4, 5), (6, 7), (2, 4), (3, 5), (1, 4), (3, 6), (1, 2), (3, 4), (5, 6))
+}
+
+
+class _Exhausted:
+    
+    def __lt__(self, other) -> bool:
+        return False
+    
+    def __gt__(self, other) -> bool:
+        return other is not self
+
+
+_EXHAUSTED = _Exhausted()
+
+
+def _compile_network(size: int, comparators: Tuple[Tuple[int, int], ...], counted: bool):
+    values = ", ".join(f"v{i}" for i in range(size))
+    lines = ["def network(data, left):",
+             f"    {values}, = data[left:left + {size}]"]
+    if counted:
+        lines.append("    swaps = 0")
+    for a, b in comparators:
+        exchange = f"v{a}, v{b} = v{b}, v{a}"
+        lines.append(f"    if v{b} < v{a}: {exchange}; swaps += 1" if counted else
+                     f"    if v{b} < v{a}: {exchange}")
+    lines.append(f"    data[left:left + {size}] = {values},")
+    if counted:
+        lines.append("    return swaps")
+    
+    namespace = {}
+    exec("\n".join(lines), namespace)
+    return namespace["network"]
+
+
+_NETWORK_KERNELS = {size: _compile_network(size, comparators, False)
+                    for size, comparators in SORTING_NETWORKS.items()}
+_COUNTED_NETWORK_KERNELS = {size: _compile_network(size, comparators, True)
+                            for size, comparators in SORTING_NETWORKS.items()}
+
+
+def _typed_copy(data):
+    if isinstance(data, memoryview):
+        if not data.c_contiguous:
+            return array(data.format, data)
+        copy = array(data.format)
+        copy.frombytes(data.cast("B"))
+        return copy
+    if isinstance(data, array):
+        return array(data.typecode, data)
+    return list(data)
+
+
+def _array_offsets(data: "np.ndarray", lo: int) -> "np.ndarray":
+    if data.dtype.kind == "u":
+        return (data - data.dtype.type(lo)).astype(np.int64)
+    return data.astype(np.int64) - lo
+
+
+class _RangeView:
+    
+    __slots__ = ("data", "left", "right")
+    
+    def __init__(self, data: List[int], left: int, right: int):
+        self.data = data
+        self.left = left
+        self.right = right
+    
+    def __len__(self) -> int:
+        return self.right - self.left
+    
+    def __iter__(self):
+        return map(self.data.__getitem__, range(self.left, self.right))
+    
+    def __getitem__(self, index):
+        positions = range(self.left, self.right)[index]
+        if isinstance(positions, range):
+            return self.data[positions.start:positions.stop:positions.step]
+        return self.data[positions]
+
 
 class SortStrategy(Enum):
     INSERTION_SORT = "InsertionSort"
@@ -10,68 +117,261 @@ class SortStrategy(Enum):
     RADIX_SORT = "RadixSort"
     QUICK_SORT = "QuickSort"
     HYBRID = "Hybrid"
+    NATURAL_MERGE = "NaturalMergeSort"
+    COUNTING_SORT = "CountingSort"
+    HEAP_SELECT = "HeapSelect"
+    INTROSELECT = "Introselect"
+    COUNTING_SELECT = "CountingSelect"
 
 
 class InputCharacteristics:
-    def __init__(self, data: List[int]):
+    PRESORTEDNESS_MODES = ("inversions", "runs")
+    HISTOGRAM_BITS = 6
+    EXACT_UNIQUE_FACTOR = 16
+    MAX_BITMAP_BITS = 24
+    
+    __slots__ = ("presortedness_mode", "size", "_data", "_data_range", "_descents",
+                 "_ascents", "_presortedness", "_unique_estimate", "_has_duplicates",
+                 "_histogram", "_bucket_shift", "_range_density", "_distribution_type",
+                 "_run_entropy", "_summary")
+    
+    def __init__(self, data: List[int], presortedness_mode: str = "inversions"):
+        if presortedness_mode not in self.PRESORTEDNESS_MODES:
+            raise ValueError(f"Unknown presortedness mode: {presortedness_mode}")
+        self.presortedness_mode = presortedness_mode
         self.size = len(data)
-        self.presortedness = self._calculate_presortedness(data)
-        self.range_density = self._calculate_range_density(data)
-        self.distribution_type = self._analyze_distribution(data)
-        self.has_duplicates = self._check_duplicates(data)
-        self.data_range = self._get_range(data)
+        self._data = data
+        self._data_range = None
+        self._descents = None
+        self._ascents = None
+        self._presortedness = None
+        self._unique_estimate = None
+        self._has_duplicates = None
+        self._histogram = None
+        self._bucket_shift = 0
+        self._range_density = None
+        self._distribution_type = None
+        self._run_entropy = None
+        self._summary = None
+    
+    @property
+    def data_range(self) -> Tuple[int, int]:
+        if self._data_range is None:
+            self._data_range = self._get_range(self._data)
+        return self._data_range
+    
+    @property
+    def ascending_runs(self) -> int:
+        if self._descents is None:
+            self._scan_order()
+        return self._descents + 1 if self.size else 0
+    
+    @property
+    def descending_runs(self) -> int:
+        if self._ascents is None:
+            self._scan_order()
+        return self._ascents + 1 if self.size else 0
+    
+    @property
+    def run_entropy(self) -> float:
+        if self._run_entropy is None:
+            self._run_entropy = self._calculate_run_entropy()
+        return self._run_entropy
+    
+    @property
+    def presortedness(self) -> float:
+        if self._presortedness is None:
+            self._presortedness = self._calculate_presortedness(self._data)
+        return self._presortedness
+    
+    @property
+    def unique_estimate(self) -> int:
+        if self._unique_estimate is None:
+            self._scan_values()
+        return self._unique_estimate
+    
+    @property
+    def has_duplicates(self) -> bool:
+        if self._has_duplicates is None:
+            self._scan_values()
+        return self._has_duplicates
+    
+    @property
+    def histogram(self) -> List[int]:
+        if self._histogram is None:
+            self._scan_values()
+        return self._histogram
+    
+    @property
+    def range_density(self) -> float:
+        if self._range_density is None:
+            self._range_density = self._calculate_range_density()
+        return self._range_density
+    
+    @property
+    def distribution_type(self) -> str:
+        if self._distribution_type is None:
+            self._distribution_type = self._analyze_distribution()
+        return self._distribution_type
+    
+    def summarize(self, block: int) -> "BlockSummary":
+        if self._summary is None or self._summary.block != block:
+            summary = BlockSummary(self._data, 0, self.size, block, self.presortedness_mode)
+            if self._data_range is None:
+                self._data_range = (min(summary.lows), max(summary.highs))
+            if self._descents is None:
+                self._descents = summary.descents[-1]
+                self._ascents = summary.ascents[-1]
+            self._summary = summary
+        return self._summary
+    
+    def _scan_order(self):
+        data = self._data
+        tail = islice(data, 1, None)
+        self._descents = sum(map(operator.gt, data, tail))
+        tail = islice(data, 1, None)
+        self._ascents = sum(map(operator.lt, data, tail))
+    
+    def _run_breaks(self):
+        data = self._data
+        compare = operator.gt if self.ascending_runs <= self.descending_runs else operator.lt
+        return compress(count(1), map(compare, data, islice(data, 1, None)))
+    
+    def _calculate_run_entropy(self) -> float:
+        n = len(self._data)
+        if n <= 1:
+            return 0.0
+        
+        entropy = 0.0
+        start = 0
+        for stop in chain(self._run_breaks(), (n,)):
+            length = stop - start
+            entropy += length * math.log2(n / length)
+            start = stop
+        return entropy / n
+    
+    def _scan_values(self):
+        data = self._data
+        n = len(data)
+        if n == 0:
+            self._unique_estimate = 0
+            self._has_duplicates = False
+            self._histogram = []
+            return
+        
+        lo, hi = self.data_range
+        value_range = hi - lo
+        shift = max(0, value_range.bit_length() - self.HISTOGRAM_BITS)
+        histogram = [0] * ((value_range >> shift) + 1)
+        
+        if value_range < self.EXACT_UNIQUE_FACTOR * n:
+            seen = bytearray(value_range + 1)
+            for value in data:
+                offset = value - lo
+                histogram[offset >> shift] += 1
+                seen[offset] = 1
+            
+            unique = len(seen) - seen.count(0)
+            has_duplicates = unique < n
+        else:
+            bits = min(self.MAX_BITMAP_BITS, (8 * n).bit_length())
+            mask = (1 << bits) - 1
+            seen = bytearray(mask + 1)
+            for value in data:
+                histogram[(value - lo) >> shift] += 1
+                seen[((value * 0x9E3779B1) >> 16) & mask] = 1
+            
+            unique, has_duplicates = self._linear_count(seen.count(0), len(seen), n)
         
+        self._unique_estimate = unique
+        self._has_duplicates = has_duplicates
+        self._histogram = histogram
+        self._bucket_shift = shift
+    
+    def _linear_count(self, zeros: int, slots: int, n: int) -> Tuple[int, bool]:
+        if zeros == 0:
+            return n, False
+        
+        estimate = min(n, -slots * math.log(zeros / slots))
+        load = estimate / slots
+        std_error = math.sqrt(slots * (math.exp(load) - load - 1))
+        return max(1, round(estimate)), estimate < n - 3 * std_error
+    
     def _calculate_presortedness(self, data: List[int]) -> float:
-        if len(data) <= 1:
+        n = len(data)
+        if n <= 1:
             return 1.0
         
-        runs = 0
-        inversions = 0
-        max_inversions = (len(data) * (len(data) - 1)) // 2
+        descents = self.ascending_runs - 1
+        if self.presortedness_mode == "runs" or descents == 0:
+            return 1 - (descents / (n - 1))
         
-        for i in range(len(data) - 1):
-            if data[i] <= data[i + 1]:
-                runs += 1
-            for j in range(i + 1, len(data)):
-                if data[i] > data[j]:
-                    inversions += 1
+        if self.descending_runs == 1 and descents == n - 1:
+            return 0.0
         
-        if max_inversions == 0:
-            return 1.0
+        max_inversions = (n * (n - 1)) // 2
+        inversions = self._count_inversions(data)
         
         presorted_score = 1 - (inversions / max_inversions)
         return presorted_score
     
-    def _calculate_range_density(self, data: List[int]) -> float:
-        if len(data) == 0:
+    def _count_inversions(self, data: List[int]) -> int:
+        n = len(data)
+        src = _typed_copy(data)
+        dst = _typed_copy(data)
+        inversions = 0
+        width = 1
+        
+        while width < n:
+            for left in range(0, n, 2 * width):
+                mid = min(left + width, n)
+                right = min(left + 2 * width, n)
+                i, j, k = left, mid, left
+                
+                while i < mid and j < right:
+                    if src[i] <= src[j]:
+                        dst[k] = src[i]
+                        i += 1
+                    else:
+                        dst[k] = src[j]
+                        inversions += mid - i
+                        j += 1
+                    k += 1
+                
+                if i < mid:
+                    dst[k:right] = src[i:mid]
+                else:
+                    dst[k:right] = src[j:right]
+            
+            src, dst = dst, src
+            width *= 2
+        
+        return inversions
+    
+    def _calculate_range_density(self) -> float:
+        if self.size == 0:
             return 0.0
         
-        min_val = min(data)
-        max_val = max(data)
+        min_val, max_val = self.data_range
         value_range = max_val - min_val
         
         if value_range == 0:
             return 1.0
         
-        unique_count = len(set(data))
-        density = unique_count / (value_range + 1)
+        density = self.unique_estimate / (value_range + 1)
         return density
     
-    def _analyze_distribution(self, data: List[int]) -> str:
-        if len(data) == 0:
+    def _analyze_distribution(self) -> str:
+        if self.size == 0:
             return "small"
         
-        unique_values = len(set(data))
-        if unique_values == 1:
+        if self.unique_estimate == 1:
             return "uniform"
         
-        if len(data) < 10:
+        if self.size < 10:
             return "small"
         
-        sorted_data = sorted(data)
-        q1 = sorted_data[len(data) // 4]
-        q2 = sorted_data[len(data) // 2]
-        q3 = sorted_data[3 * len(data) // 4]
+        q1, q2, q3 = self._quartiles()
         
         iqr = q3 - q1
         lower_spread = q2 - q1
@@ -89,8 +389,22 @@ class InputCharacteristics:
         else:
             return "highly_skewed"
     
-    def _check_duplicates(self, data: List[int]) -> bool:
-        return len(data) != len(set(data))
+    def _quartiles(self) -> Tuple[float, float, float]:
+        return (self._histogram_quantile(self.size // 4),
+                self._histogram_quantile(self.size // 2),
+                self._histogram_quantile(3 * self.size // 4))
+    
+    def _histogram_quantile(self, rank: int) -> float:
+        histogram = self.histogram
+        width = 1 << self._bucket_shift
+        seen = 0
+        for bucket, count in enumerate(histogram):
+            if seen + count > rank:
+                if width == 1:
+                    return self.data_range[0] + bucket
+                return self.data_range[0] + (bucket + (rank - seen) / count) * width
+            seen += count
+        return self.data_range[1]
     
     def _get_range(self, data: List[int]) -> Tuple[int, int]:
         if len(data) == 0:
@@ -105,34 +419,399 @@ class InputCharacteristics:
                 f"duplicates={self.has_duplicates})")
 
 
+class SampledCharacteristics(InputCharacteristics):
+    DEFAULT_BUDGET = 4096
+    DEFAULT_CONFIDENCE = 0.95
+    
+    __slots__ = ("_source", "sample_size", "sampled", "confidence", "presortedness_error")
+    
+    def __init__(self, data: List[int], presortedness_mode: str = "inversions",
+                 budget: int = DEFAULT_BUDGET, confidence: float = DEFAULT_CONFIDENCE):
+        if budget < 2:
+            raise ValueError("Sampling budget must be at least 2")
+        if not 0 < confidence < 1:
+            raise ValueError("Confidence must be between 0 and 1")
+        
+        size = len(data)
+        step = max(1, -(-size // budget))
+        sample = data[::step]
+        
+        super().__init__(sample, presortedness_mode)
+        self.size = size
+        self._source = data
+        self.sample_size = len(sample)
+        self.sampled = step > 1
+        self.confidence = confidence
+        self.presortedness_error = 0.0
+        
+        if self.sampled:
+            self.presortedness_error = self._presortedness_bound(self.sample_size, confidence)
+    
+    @property
+    def data_range(self) -> Tuple[int, int]:
+        if self._data_range is None:
+            self._data_range = self._get_range(self._source)
+        return self._data_range
+    
+    def _scan_values(self):
+        super()._scan_values()
+        if self.sampled:
+            self._estimate_uniqueness(self._data)
+    
+    def _presortedness_bound(self, sample_size: int, confidence: float) -> float:
+        pairs = sample_size // 2
+        if pairs == 0:
+            return 1.0
+        return min(1.0, math.sqrt(math.log(2 / (1 - confidence)) / (2 * pairs)))
+    
+    def _estimate_uniqueness(self, sample: List[int]):
+        counts = {}
+        for value in sample:
+            counts[value] = counts.get(value, 0) + 1
+        
+        singletons = sum(1 for c in counts.values() if c == 1)
+        doubletons = sum(1 for c in counts.values() if c == 2)
+        repeated = len(counts) - singletons
+        estimate = len(counts) + singletons * (singletons - 1) / (2 * (doubletons + 1))
+        
+        min_val, max_val = self.data_range
+        value_range = max_val - min_val
+        self._unique_estimate = int(max(len(counts), min(estimate, self.size, value_range + 1)))
+        self._has_duplicates = repeated > 0 or value_range + 1 < self.size
+    
+    def __repr__(self) -> str:
+        return (f"SampledCharacteristics(size={self.size}, "
+                f"sample_size={self.sample_size}, "
+                f"presortedness={self.presortedness:.2f}"
+                f"±{self.presortedness_error:.3f}, "
+                f"range_density={self.range_density:.2f}, "
+                f"distribution={self.distribution_type}, "
+                f"duplicates={self.has_duplicates})")
+
+
+class ArrayCharacteristics(InputCharacteristics):
+    __slots__ = ()
+    
+    def __init__(self, data: "np.ndarray", presortedness_mode: str = "inversions"):
+        if np is None:
+            raise ImportError("ArrayCharacteristics requires NumPy")
+        if data.ndim != 1 or data.dtype.kind not in "iu":
+            raise TypeError("ArrayCharacteristics expects a one-dimensional integer array")
+        super().__init__(data, presortedness_mode)
+    
+    def _get_range(self, data: "np.ndarray") -> Tuple[int, int]:
+        if data.size == 0:
+            return (0, 0)
+        return (int(data.min()), int(data.max()))
+    
+    def _scan_order(self):
+        data = self._data
+        self._descents = int(np.count_nonzero(data[1:] < data[:-1]))
+        self._ascents = int(np.count_nonzero(data[1:] > data[:-1]))
+    
+    def _calculate_run_entropy(self) -> float:
+        data = self._data
+        n = data.size
+        if n <= 1:
+            return 0.0
+        
+        if self.ascending_runs <= self.descending_runs:
+            breaks = np.flatnonzero(data[1:] < data[:-1]) + 1
+        else:
+            breaks = np.flatnonzero(data[1:] > data[:-1]) + 1
+        lengths = np.diff(np.concatenate(([0], breaks, [n])))
+        return float(np.sum(lengths * np.log2(n / lengths)) / n)
+    
+    def _scan_values(self):
+        data = self._data
+        n = data.size
+        if n == 0:
+            self._unique_estimate = 0
+            self._has_duplicates = False
+            self._histogram = []
+            return
+        
+        lo, hi = self.data_range
+        value_range = hi - lo
+        shift = max(0, value_range.bit_length() - self.HISTOGRAM_BITS)
+        buckets = (value_range >> shift) + 1
+        
+        if value_range < self.EXACT_UNIQUE_FACTOR * n:
+            offsets = _array_offsets(data, lo)
+            unique = int(np.count_nonzero(np.bincount(offsets, minlength=value_range + 1)))
+            histogram = np.bincount(offsets >> shift, minlength=buckets)
+        else:
+            unique = int(np.unique(data).size)
+            edges = [lo + (bucket << shift) for bucket in range(buckets + 1)]
+            histogram, _ = np.histogram(data.astype(np.float64), bins=np.array(edges, dtype=np.float64))
+        
+        self._unique_estimate = unique
+        self._has_duplicates = unique < n
+        self._histogram = histogram.tolist()
+        self._bucket_shift = shift
+    
+    def _quartiles(self) -> Tuple[float, float, float]:
+        ranks = [self.size // 4, self.size // 2, 3 * self.size // 4]
+        values = np.partition(self._data, ranks)[ranks]
+        return tuple(int(value) for value in values)
+    
+    def _count_inversions(self, data: "np.ndarray") -> int:
+        n = data.size
+        ranks = np.empty(n, dtype=np.int64)
+        ranks[np.argsort(data, kind="stable")] = np.arange(n, dtype=np.int64)
+        
+        positions = np.arange(n, dtype=np.int64)
+        inversions = 0
+        width = 1
+        while width < n:
+            pair = positions // (2 * width)
+            in_right = (positions // width) % 2 == 1
+            keys = pair * n + ranks
+            
+            right_pairs = pair[in_right]
+            below = np.searchsorted(keys[~in_right], keys[in_right]) - right_pairs * width
+            left_sizes = np.minimum(width, n - right_pairs * 2 * width)
+            inversions += int((left_sizes - below).sum())
+            
+            ranks = np.sort(keys) - pair * n
+            width *= 2
+        
+        return inversions
+    
+    def __repr__(self) -> str:
+        return "Array" + super().__repr__()
+
+
+class BlockSummary:
+    
+    __slots__ = ("data", "left", "right", "block", "presortedness_mode", "lows", "highs",
+                 "descents", "ascents", "head_descents", "head_ascents")
+    
+    def __init__(self, data: List[int], left: int, right: int, block: int,
+                 presortedness_mode: str = "inversions"):
+        self.data = data
+        self.left = left
+        self.right = right
+        self.block = block
+        self.presortedness_mode = presortedness_mode
+        self.lows = []
+        self.highs = []
+        self.head_descents = []
+        self.head_ascents = []
+        descents = []
+        ascents = []
+        
+        for start in range(left, right, block):
+            chunk = data[max(left, start - 1):min(start + block, right)]
+            self.lows.append(min(chunk))
+            self.highs.append(max(chunk))
+            descents.append(sum(map(operator.gt, chunk, islice(chunk, 1, None))))
+            ascents.append(sum(map(operator.lt, chunk, islice(chunk, 1, None))))
+            head = start > left
+            self.head_descents.append(head and chunk[0] > chunk[1])
+            self.head_ascents.append(head and chunk[0] < chunk[1])
+        
+        self.descents = [0, *accumulate(descents)]
+        self.ascents = [0, *accumulate(ascents)]
+    
+    def segment(self, left: int, right: int) -> "SegmentCharacteristics":
+        first, last = self._blocks(left, right)
+        return self._segment(left, right, first, last,
+                             (min(self.lows[first:last]), max(self.highs[first:last])))
+    
+    def splits(self, left: int, right: int, min_size: int):
+        first, last = self._blocks(left, right)
+        lows = self.lows[first:last]
+        highs = self.highs[first:last]
+        head_lows = list(accumulate(lows, min))
+        head_highs = list(accumulate(highs, max))
+        tail_lows = list(accumulate(reversed(lows), min))[::-1]
+        tail_highs = list(accumulate(reversed(highs), max))[::-1]
+        
+        margin = -(-min_size // self.block)
+        for index in range(margin, last - first - margin + 1):
+            mid = self.left + (first + index) * self.block
+            if mid - left < min_size or right - mid < min_size:
+                continue
+            yield (self._segment(left, mid, first, first + index,
+                                 (head_lows[index - 1], head_highs[index - 1])),
+                   self._segment(mid, right, first + index, last,
+                                 (tail_lows[index], tail_highs[index])))
+    
+    def _blocks(self, left: int, right: int) -> Tuple[int, int]:
+        return (left - self.left) // self.block, -(-(right - self.left) // self.block)
+    
+    def _segment(self, left: int, right: int, first: int, last: int,
+                 data_range: Tuple[int, int]) -> "SegmentCharacteristics":
+        return SegmentCharacteristics(
+            self.data, left, right, data_range, self.presortedness_mode,
+            self.descents[last] - self.descents[first] - self.head_descents[first],
+            self.ascents[last] - self.ascents[first] - self.head_ascents[first])
+
+
+class SegmentCharacteristics(InputCharacteristics):
+    __slots__ = ("left", "right")
+    
+    def __init__(self, data: List[int], left: int, right: int, data_range: Tuple[int, int],
+                 presortedness_mode: str, descents: int, ascents: int):
+        super().__init__(_RangeView(data, left, right), presortedness_mode)
+        self.left = left
+        self.right = right
+        self._data_range = data_range
+        self._descents = descents
+        self._ascents = ascents
+        self._unique_estimate = min(self.size, data_range[1] - data_range[0] + 1)
+    
+    def _calculate_run_entropy(self) -> float:
+        return math.log2(min(self.ascending_runs, self.descending_runs))
+    
+    def __repr__(self) -> str:
+        return f"Segment[{self.left}:{self.right}]" + super().__repr__()
+
+
 class SmartSort:
     INSERTION_THRESHOLD = 20
+    INSERTION_SHIFT_FACTOR = 1
+    NETWORK_MIN_SIZE = 5
+    NETWORK_MAX_SIZE = 8
     RADIX_DENSITY_THRESHOLD = 0.01
+    RADIX_RANGE_FACTOR = 10
     PRESORTED_THRESHOLD = 0.7
+    NATURAL_RUN_RATIO = 32
+    RADIX_DIGIT_BITS = (8, 11, 16)
+    RADIX_PASS_FACTOR = 4
+    COUNTING_RANGE_RATIO = 0.5
+    NINTHER_THRESHOLD = 128
+    HYBRID_THRESHOLD = 2048
+    HEAP_SELECT_RATIO = 64
+    SEGMENT_BLOCK_SIZE = 1024
+    SEGMENT_BLOCKS = 256
+    SEGMENT_MIN_SIZE = 4096
+    SEGMENT_ANALYSIS_FACTOR = 4
+    INSERTION_SAMPLE_SIZE = 1024
+    MIN_GALLOP = 7
+    STATS_MODES = ("off", "counters", "trace")
+    SELECTION_MODES = ("cost", "rules")
+    COST_MODEL = {
+        "insertion_element": 1.1e-7,
+        "insertion_shift": 7.5e-8,
+        "merge_compare": 1.2e-7,
+        "introsort_compare": 1.1e-7,
+        "run_scan": 1.5e-7,
+        "run_merge": 2.0e-7,
+        "counting_element": 6.0e-8,
+        "counting_value": 7.5e-8,
+        "counting_distinct": 4.0e-7,
+        "radix_element": 3.1e-7,
+        "radix_bucket": 7.5e-8
+    }
+    TUNABLE_PARAMETERS = {
+        "INSERTION_THRESHOLD": int,
+        "PRESORTED_THRESHOLD": float,
+        "RADIX_DENSITY_THRESHOLD": float,
+        "RADIX_RANGE_FACTOR": int,
+        "COST_MODEL": dict
+    }
+    PROFILE_ENV = "SMARTSORT_PROFILE"
+    DEFAULT_PROFILE = os.path.join(os.path.expanduser("~"), ".smartsort_profile.json")
     
-    def __init__(self, verbose: bool = False):
+    def __init__(self, verbose: bool = False, presortedness_mode: str = "inversions",
+                 analysis_budget: Optional[int] = None, radix_bits: Optional[int] = None,
+                 collect_stats: str = "counters", profile: Optional[str] = None,
+                 selection: str = "cost"):
+        if radix_bits is not None and radix_bits not in self.RADIX_DIGIT_BITS:
+            raise ValueError(f"radix_bits must be one of {self.RADIX_DIGIT_BITS}")
+        if collect_stats not in self.STATS_MODES:
+            raise ValueError(f"collect_stats must be one of {self.STATS_MODES}")
+        if selection not in self.SELECTION_MODES:
+            raise ValueError(f"selection must be one of {self.SELECTION_MODES}")
         self.verbose = verbose
+        self.collect_stats = collect_stats
+        self.selection = selection
+        self._count_ops = collect_stats != "off"
+        self.profile = self._load_profile(profile)
+        self.presortedness_mode = presortedness_mode
+        self.analysis_budget = analysis_budget
+        self.radix_bits = radix_bits
+        self._reset_stats()
+    
+    def _load_profile(self, path: Optional[str]) -> Optional[str]:
+        if path is None:
+            path = os.environ.get(self.PROFILE_ENV, self.DEFAULT_PROFILE)
+            if not os.path.exists(path):
+                return None
+        
+        with open(path) as stream:
+            parameters = json.load(stream).get("parameters", {})
+        for name, value in parameters.items():
+            if name not in self.TUNABLE_PARAMETERS:
+                raise ValueError(f"Unknown tuning parameter {name!r} in {path}")
+            if name == "COST_MODEL":
+                unknown = set(value) - set(self.COST_MODEL)
+                if unknown:
+                    raise ValueError(f"Unknown cost constants {sorted(unknown)} in {path}")
+                value = {**self.COST_MODEL, **value}
+            setattr(self, name, self.TUNABLE_PARAMETERS[name](value))
+        return path
+    
+    def _reset_stats(self):
         self.stats = {
             "comparisons": 0,
             "swaps": 0,
             "strategy_switches": [],
+            "analyzed_elements": 0,
+            "insertion_bailouts": 0,
             "execution_time": 0
         }
+        if self.collect_stats == "trace":
+            self.stats["trace"] = []
     
-    def sort(self, data: List[int]) -> List[int]:
+    def _record(self, kernel: str, left: int, right: int, comparisons: int, swaps: int):
+        if not self._count_ops:
+            return
+        
+        stats = self.stats
+        stats["comparisons"] += comparisons
+        stats["swaps"] += swaps
+        if self.collect_stats == "trace":
+            stats["trace"].append({
+                "kernel": kernel,
+                "range": (left, right),
+                "comparisons": comparisons,
+                "swaps": swaps
+            })
+    
+    def sort(self, data: List[int], key: Optional[Callable[[Any], Any]] = None,
+             reverse: bool = False) -> List[int]:
+        if not isinstance(data, (list, array)) and not (np is not None and isinstance(data, np.ndarray)):
+            data = self._buffer_copy(data)
+            if isinstance(data, array) and key is None and not reverse:
+                return self.sort_buffer(data)
+        
+        if key is not None or reverse:
+            if isinstance(data, array) or (np is not None and isinstance(data, np.ndarray)):
+                return self._sort_typed_keyed(data, key, reverse)
+            return self._sort_keyed(data, key, reverse)
+        
+        if isinstance(data, array):
+            return self.sort_buffer(array(data.typecode, data))
+        
         start_time = time.time()
-        self.stats = {
-            "comparisons": 0,
-            "swaps": 0,
-            "strategy_switches": [],
-            "execution_time": 0
-        }
+        self._reset_stats()
+        
+        is_array = np is not None and isinstance(data, np.ndarray)
+        if is_array and (data.ndim != 1 or data.dtype.kind not in "iu"):
+            raise TypeError("SmartSort only sorts one-dimensional integer arrays")
         
         if len(data) <= 1:
             return data.copy()
         
         result = data.copy()
-        characteristics = InputCharacteristics(result)
+        characteristics = self._analyze(result)
+        if not is_array:
+            block = self._summary_block(characteristics, self._segment_budget(len(result)))
+            if block is not None:
+                characteristics.summarize(block)
         
         if self.verbose:
             print(f"\n{characteristics}")
@@ -140,7 +819,348 @@ class SmartSort:
         strategy = self._select_strategy(characteristics)
         self._log_strategy(strategy, 0, len(result))
         
-        result = self._adaptive_sort(result, 0, len(result), characteristics)
+        if is_array:
+            result = self._sort_array(result, strategy, characteristics)
+        else:
+            costs = self._prediction_costs(characteristics, strategy)
+            kernel_start = time.perf_counter()
+            result = self._adaptive_sort(result, 0, len(result), characteristics)
+            self._record_prediction(costs, strategy, time.perf_counter() - kernel_start)
+        
+        self.stats["execution_time"] = time.time() - start_time
+        
+        if self.verbose:
+            self._print_stats()
+        
+        return result
+    
+    def _buffer_copy(self, data):
+        try:
+            view = memoryview(data)
+        except TypeError:
+            return data
+        if view.ndim != 1 or view.format not in BUFFER_FORMATS:
+            raise TypeError(f"Unsupported buffer format: {view.format!r}; use a one-dimensional "
+                            f"buffer of one of {BUFFER_FORMATS!r} or sort_buffer")
+        return _typed_copy(view)
+    
+    def sort_inplace(self, data: List[Any], key: Optional[Callable[[Any], Any]] = None,
+                     reverse: bool = False):
+        data[:] = self.sort(data, key=key, reverse=reverse)
+    
+    def _sort_typed_keyed(self, data, key: Optional[Callable[[Any], Any]], reverse: bool):
+        if key is not None:
+            items = self._sort_keyed(data, key, reverse)
+            if isinstance(data, array):
+                return array(data.typecode, items)
+            return np.array(items, dtype=data.dtype)
+        
+        result = self.sort(data)
+        if isinstance(result, array):
+            result.reverse()
+            return result
+        return result[::-1].copy()
+    
+    def _sort_keyed(self, data: List[Any], key: Optional[Callable[[Any], Any]],
+                    reverse: bool) -> List[Any]:
+        start_time = time.time()
+        self._reset_stats()
+        
+        items = list(data)
+        if reverse:
+            items.reverse()
+        
+        n = len(items)
+        if n > 1:
+            keys = items if key is None else [key(item) for item in items]
+            if all(type(k) is int for k in keys):
+                keys = self._compact_keys(keys)
+                characteristics = self._analyze(keys)
+                if self.verbose:
+                    print(f"\n{characteristics}")
+                strategy = self._select_strategy(characteristics)
+                
+                if strategy == SortStrategy.COUNTING_SORT:
+                    items = self._counting_sort_by_key(items, keys, *characteristics.data_range)
+                elif strategy == SortStrategy.RADIX_SORT:
+                    items = self._radix_sort_by_key(items, keys)
+                else:
+                    items = self._comparison_sort_by_key(items, keys, strategy)
+            else:
+                strategy = SortStrategy.NATURAL_MERGE
+                items = self._comparison_sort_by_key(items, keys, strategy)
+            self._log_strategy(strategy, 0, n)
+        
+        if reverse:
+            items.reverse()
+        
+        self.stats["execution_time"] = time.time() - start_time
+        
+        if self.verbose:
+            self._print_stats()
+        
+        return items
+    
+    def _compact_keys(self, keys: List[int]):
+        try:
+            return array("q", keys)
+        except OverflowError:
+            return keys if isinstance(keys, list) else list(keys)
+    
+    def _counting_sort_by_key(self, items: List[Any], keys, lo: int, hi: int) -> List[Any]:
+        counts = [0] * (hi - lo + 1)
+        for k in keys:
+            counts[k - lo] += 1
+        
+        total = 0
+        for offset, count in enumerate(counts):
+            counts[offset] = total
+            total += count
+        
+        result = [None] * len(items)
+        for item, k in zip(items, keys):
+            offset = k - lo
+            result[counts[offset]] = item
+            counts[offset] += 1
+        
+        self._record("counting", 0, len(items), len(items), len(items))
+        return result
+    
+    def _radix_sort_by_key(self, items: List[Any], keys) -> List[Any]:
+        n = len(items)
+        lo, hi = min(keys), max(keys)
+        bits, passes = self._radix_plan(hi - lo, n)
+        mask = (1 << bits) - 1
+        digits = [(p * bits, [0] * (mask + 1)) for p in range(passes)]
+        
+        for k in keys:
+            k -= lo
+            for shift, counts in digits:
+                counts[(k >> shift) & mask] += 1
+        
+        src_items, src_keys = items, keys
+        spare_items, spare_keys = [None] * n, _typed_copy(keys)
+        moved = 0
+        for shift, counts in digits:
+            if max(counts) == n:
+                continue
+            
+            total = 0
+            for digit in range(mask + 1):
+                count = counts[digit]
+                counts[digit] = total
+                total += count
+            
+            dst_items, dst_keys = spare_items, spare_keys
+            for item, k in zip(src_items, src_keys):
+                digit = ((k - lo) >> shift) & mask
+                position = counts[digit]
+                dst_items[position] = item
+                dst_keys[position] = k
+                counts[digit] = position + 1
+            spare_items, spare_keys = src_items, src_keys
+            src_items, src_keys = dst_items, dst_keys
+            moved += n
+        
+        self._record("radix", 0, n, n, moved)
+        return src_items
+    
+    def _comparison_sort_by_key(self, items: List[Any], keys, strategy: SortStrategy) -> List[Any]:
+        n = len(items)
+        decorated = list(zip(keys, range(n)))
+        
+        if strategy == SortStrategy.INSERTION_SORT:
+            self._bounded_insertion_sort(decorated, 0, n)
+        elif strategy in (SortStrategy.HYBRID, SortStrategy.QUICK_SORT):
+            self._introsort(decorated, 0, n)
+        elif strategy == SortStrategy.MERGE_SORT:
+            self._merge_sort(decorated, 0, n)
+        else:
+            self._natural_merge_sort(decorated, 0, n)
+        
+        return [items[index] for _, index in decorated]
+    
+    def sort_counts(self, data: List[int]) -> List[Tuple[int, int]]:
+        if len(data) == 0:
+            return []
+        
+        if np is not None and isinstance(data, np.ndarray):
+            values, counts = np.unique(data, return_counts=True)
+            return list(zip(values.tolist(), counts.tolist()))
+        
+        counts = Counter(data)
+        lo, hi = min(counts), max(counts)
+        if hi - lo + 1 <= len(counts) * 2:
+            get = counts.get
+            return [(value, get(value)) for value in range(lo, hi + 1) if value in counts]
+        return sorted(counts.items())
+    
+    def topk(self, data: List[int], k: int) -> List[int]:
+        if k < 0:
+            raise ValueError("k must be non-negative")
+        
+        start_time = time.time()
+        self._reset_stats()
+        
+        result = self._smallest(list(data), k)
+        
+        self.stats["execution_time"] = time.time() - start_time
+        
+        if self.verbose:
+            self._print_stats()
+        
+        return result
+    
+    def partial_sort(self, data: List[int], k: int) -> List[int]:
+        if k < 0:
+            raise ValueError("k must be non-negative")
+        
+        start_time = time.time()
+        self._reset_stats()
+        
+        items = list(data)
+        n = len(items)
+        result = self._smallest(items, k)
+        if len(result) < n:
+            pivot = result[-1] if result else None
+            if pivot is None:
+                result = items
+            else:
+                rest = [value for value in items if pivot < value]
+                rest.extend(repeat(pivot, n - len(result) - len(rest)))
+                result.extend(rest)
+        
+        self.stats["execution_time"] = time.time() - start_time
+        
+        if self.verbose:
+            self._print_stats()
+        
+        return result
+    
+    def select(self, data: List[int], nth: int) -> int:
+        items = list(data)
+        n = len(items)
+        if not 0 <= nth < n:
+            raise IndexError("nth is out of range")
+        
+        start_time = time.time()
+        self._reset_stats()
+        
+        characteristics = self._analyze(items)
+        if self.verbose:
+            print(f"\n{characteristics}")
+        
+        strategy = self._select_selection_strategy(characteristics, nth + 1)
+        self._log_strategy(strategy, nth, nth + 1)
+        
+        if strategy == SortStrategy.COUNTING_SELECT:
+            result = self._counting_select(items, nth + 1, *characteristics.data_range)[-1]
+        elif strategy == SortStrategy.HEAP_SELECT:
+            result = self._heap_select(items, nth + 1)[0]
+        else:
+            self._introselect(items, 0, n, nth)
+            result = items[nth]
+        
+        self.stats["execution_time"] = time.time() - start_time
+        
+        if self.verbose:
+            self._print_stats()
+        
+        return result
+    
+    def iter_sorted(self, data: List[int]):
+        start_time = time.time()
+        self._reset_stats()
+        
+        items = list(data)
+        n = len(items)
+        try:
+            if n <= 1:
+                yield from items
+                return
+            
+            characteristics = self._analyze(items)
+            if self.verbose:
+                print(f"\n{characteristics}")
+            
+            lo, hi = characteristics.data_range
+            presorted = characteristics.ascending_runs == 1
+            if presorted and getattr(characteristics, "sampled", False):
+                presorted = not any(map(operator.gt, items, islice(items, 1, None)))
+            if presorted:
+                self._log_strategy(SortStrategy.NATURAL_MERGE, 0, n)
+                yield from items
+            elif hi - lo + 1 <= n * self.COUNTING_RANGE_RATIO:
+                self._log_strategy(SortStrategy.COUNTING_SORT, 0, n)
+                counts = Counter(items)
+                self._record("counting", 0, n, n, n)
+                for value in range(lo, hi + 1):
+                    count = counts.get(value)
+                    if count:
+                        yield from repeat(value, count)
+            else:
+                self._log_strategy(SortStrategy.QUICK_SORT, 0, n)
+                yield from self._incremental_quicksort(items)
+        finally:
+            self.stats["execution_time"] = time.time() - start_time
+    
+    def _incremental_quicksort(self, data: List[int]):
+        n = len(data)
+        threshold = self.INSERTION_THRESHOLD
+        bounds = [(n, 2 * n.bit_length())]
+        lo = 0
+        while lo < n:
+            hi, depth = bounds[-1]
+            if hi - lo <= threshold or depth <= 0:
+                if hi - lo <= threshold:
+                    self._small_sort(data, lo, hi)
+                    yield from islice(data, lo, hi)
+                else:
+                    yield from self._heap_pops(data, lo, hi)
+                if hi < n:
+                    yield data[hi]
+                bounds.pop()
+                lo = hi + 1
+                continue
+            
+            depth -= 1
+            mid = self._partition(data, lo, hi, self._choose_pivot(data, lo, hi))
+            if min(mid - lo, hi - mid - 1) < (hi - lo) >> 3:
+                depth -= 1
+                self._break_patterns(data, lo, mid, hi)
+            bounds[-1] = (hi, depth)
+            bounds.append((mid, depth))
+    
+    def _heap_pops(self, data: List[int], lo: int, hi: int):
+        heap = data[lo:hi]
+        heapq.heapify(heap)
+        self._record("heap", lo, hi, 0, hi - lo)
+        while heap:
+            yield heapq.heappop(heap)
+    
+    def resort(self, sorted_base: List[int], inserts: List[int] = (),
+               deletes: List[int] = ()) -> List[int]:
+        start_time = time.time()
+        self._reset_stats()
+        
+        deletes = self._sort_delta(deletes)
+        inserts = self._sort_delta(inserts)
+        
+        result = []
+        pos = 0
+        n = len(sorted_base)
+        for value in deletes:
+            index = bisect_left(sorted_base, value, pos)
+            if index == n or sorted_base[index] != value:
+                raise ValueError(f"{value!r} is not in sorted_base")
+            result.extend(sorted_base[pos:index])
+            pos = index + 1
+        result.extend(sorted_base[pos:])
+        
+        mid = len(result)
+        result.extend(inserts)
+        self._log_strategy(SortStrategy.NATURAL_MERGE, 0, len(result))
+        self._merge_adjacent(result, 0, mid, len(result))
         
         self.stats["execution_time"] = time.time() - start_time
         
@@ -149,140 +1169,972 @@ class SmartSort:
         
         return result
     
+    def merge_sorted(self, iterables, key: Optional[Callable[[Any], Any]] = None,
+                     collect: bool = False):
+        sources = list(iterables)
+        if not collect:
+            return self._merge_stream(sources, key)
+        
+        start_time = time.time()
+        self._reset_stats()
+        
+        result = list(self._kway_merge(sources, key))
+        self._log_strategy(SortStrategy.NATURAL_MERGE, 0, len(result))
+        
+        self.stats["execution_time"] = time.time() - start_time
+        
+        if self.verbose:
+            self._print_stats()
+        
+        return result
+    
+    def _merge_stream(self, sources: List[Any], key: Optional[Callable[[Any], Any]]):
+        start_time = time.time()
+        self._reset_stats()
+        try:
+            yield from self._kway_merge(sources, key)
+        finally:
+            self.stats["execution_time"] = time.time() - start_time
+    
+    def _kway_merge(self, sources: List[Any], key: Optional[Callable[[Any], Any]]):
+        if len(sources) == 2:
+            yield from self._merge_two(iter(sources[0]), iter(sources[1]), key)
+            return
+        
+        merged = heapq.merge(*sources, key=key)
+        if not self._count_ops:
+            yield from merged
+            return
+        
+        produced = 0
+        for value in merged:
+            yield value
+            produced += 1
+        self._record("heap_merge", 0, produced,
+                     produced * max(1, (len(sources) - 1).bit_length()), produced)
+    
+    def _merge_two(self, first, second, key: Optional[Callable[[Any], Any]]):
+        a = next(first, _EXHAUSTED)
+        b = next(second, _EXHAUSTED)
+        if a is _EXHAUSTED or b is _EXHAUSTED:
+            if a is not _EXHAUSTED:
+                yield a
+                yield from first
+            elif b is not _EXHAUSTED:
+                yield b
+                yield from second
+            return
+        
+        key_a = a if key is None else key(a)
+        key_b = b if key is None else key(b)
+        produced = 0
+        while True:
+            produced += 1
+            if key_b < key_a:
+                yield b
+                b = next(second, _EXHAUSTED)
+                if b is _EXHAUSTED:
+                    yield a
+                    yield from first
+                    break
+                key_b = b if key is None else key(b)
+            else:
+                yield a
+                a = next(first, _EXHAUSTED)
+                if a is _EXHAUSTED:
+                    yield b
+                    yield from second
+                    break
+                key_a = a if key is None else key(a)
+        
+        self._record("merge", 0, produced, produced, produced)
+    
+    def _sort_delta(self, values: List[int]) -> List[int]:
+        items = list(values)
+        if len(items) > 1:
+            items = self._adaptive_sort(items, 0, len(items), self._analyze(items))
+        return items
+    
+    def _smallest(self, items: List[int], k: int) -> List[int]:
+        n = len(items)
+        k = min(k, n)
+        if k == 0:
+            return []
+        
+        characteristics = self._analyze(items)
+        if self.verbose:
+            print(f"\n{characteristics}")
+        
+        strategy = self._select_selection_strategy(characteristics, k)
+        self._log_strategy(strategy, 0, k)
+        
+        if strategy == SortStrategy.COUNTING_SELECT:
+            return self._counting_select(items, k, *characteristics.data_range)
+        if strategy == SortStrategy.HEAP_SELECT:
+            result = self._heap_select(items, k)
+        else:
+            self._introselect(items, 0, n, k - 1)
+            result = items[:k]
+        return self._introsort(result, 0, k)
+    
+    def sort_buffer(self, data, out=None):
+        start_time = time.time()
+        self._reset_stats()
+        
+        source = memoryview(data)
+        if source.ndim != 1 or source.format not in BUFFER_FORMATS:
+            raise TypeError(f"Unsupported buffer format: {source.format!r}")
+        
+        if out is None:
+            if source.readonly:
+                raise TypeError("Read-only buffers need an out= buffer to sort into")
+            target, result = source, data
+        else:
+            target, result = memoryview(out), out
+            if target.format != source.format or len(target) != len(source):
+                raise ValueError("out must have the same format and length as data")
+            if target.readonly:
+                raise TypeError("out must be a writable buffer")
+        
+        n = len(source)
+        if n <= 1:
+            if target is not source:
+                target[:] = source
+            return result
+        
+        characteristics = self._analyze(source)
+        if self.verbose:
+            print(f"\n{characteristics}")
+        
+        strategy = self._select_strategy(characteristics)
+        self._log_strategy(strategy, 0, n)
+        
+        costs = self._prediction_costs(characteristics, strategy)
+        kernel_start = time.perf_counter()
+        if strategy == SortStrategy.COUNTING_SORT:
+            self._counting_sort_into(source, target, *characteristics.data_range)
+        elif strategy == SortStrategy.RADIX_SORT:
+            self._radix_sort(source, target)
+        else:
+            if target is not source:
+                target[:] = source
+            self._sort_buffer_in_place(target, strategy, characteristics)
+        self._record_prediction(costs, strategy, time.perf_counter() - kernel_start)
+        
+        self.stats["execution_time"] = time.time() - start_time
+        
+        if self.verbose:
+            self._print_stats()
+        
+        return result
+    
+    def _analyze(self, data: List[int]) -> InputCharacteristics:
+        if np is not None and isinstance(data, np.ndarray):
+            return ArrayCharacteristics(data, self.presortedness_mode)
+        if self.analysis_budget is not None and len(data) > self.analysis_budget:
+            return SampledCharacteristics(data, self.presortedness_mode, self.analysis_budget)
+        return InputCharacteristics(data, self.presortedness_mode)
+    
     def _select_strategy(self, characteristics: InputCharacteristics) -> SortStrategy:
         if characteristics.size <= self.INSERTION_THRESHOLD:
             return SortStrategy.INSERTION_SORT
         
+        if self.selection == "cost":
+            costs = self._predict_costs(characteristics)
+            return min(costs, key=costs.get)
+        
+        runs = self._full_runs(characteristics,
+                               min(characteristics.ascending_runs, characteristics.descending_runs))
+        if runs * self.NATURAL_RUN_RATIO <= characteristics.size:
+            return SortStrategy.NATURAL_MERGE
+        
+        min_val, max_val = characteristics.data_range
+        value_range = max_val - min_val
+        
+        if value_range + 1 <= characteristics.size * self.COUNTING_RANGE_RATIO:
+            return SortStrategy.COUNTING_SORT
+        
         if characteristics.presortedness >= self.PRESORTED_THRESHOLD:
             return SortStrategy.INSERTION_SORT
         
+        if value_range > 0:
+            _, passes = self._radix_plan(value_range, characteristics.size)
+            if passes * self.RADIX_PASS_FACTOR <= characteristics.size.bit_length():
+                return SortStrategy.RADIX_SORT
+            
+            if (value_range < characteristics.size * self.RADIX_RANGE_FACTOR and
+                characteristics.range_density >= self.RADIX_DENSITY_THRESHOLD):
+                return SortStrategy.RADIX_SORT
+        
+        if characteristics.size >= self.HYBRID_THRESHOLD:
+            return SortStrategy.HYBRID
+        
+        return SortStrategy.MERGE_SORT
+    
+    def _predict_costs(self, characteristics: InputCharacteristics) -> Dict[SortStrategy, float]:
+        model = self.COST_MODEL
+        n = characteristics.size
+        levels = max(1.0, math.log2(n))
         min_val, max_val = characteristics.data_range
         value_range = max_val - min_val
+        if min(characteristics.ascending_runs, characteristics.descending_runs) == 1:
+            distinct = max(characteristics.ascending_runs, characteristics.descending_runs)
+        else:
+            distinct = characteristics.unique_estimate
         
-        if (value_range > 0 and 
-            characteristics.range_density >= self.RADIX_DENSITY_THRESHOLD and
-            value_range < characteristics.size * 10 and
-            min_val >= 0):
-            return SortStrategy.RADIX_SORT
+        costs = {
+            SortStrategy.NATURAL_MERGE: n * (model["run_scan"] +
+                                             characteristics.run_entropy * model["run_merge"]),
+            SortStrategy.COUNTING_SORT: (n * model["counting_element"] +
+                                         (value_range + 1) * model["counting_value"] +
+                                         distinct * model["counting_distinct"]),
+            SortStrategy.HYBRID: n * levels * model["introsort_compare"],
+            SortStrategy.MERGE_SORT: n * levels * model["merge_compare"]
+        }
+        if value_range > 0:
+            bits, passes = self._radix_plan(value_range, n)
+            costs[SortStrategy.RADIX_SORT] = passes * (n * model["radix_element"] +
+                                                      (1 << bits) * model["radix_bucket"])
         
-        return SortStrategy.MERGE_SORT
+        if isinstance(characteristics, SegmentCharacteristics):
+            return costs
+        floor = n * model["insertion_element"]
+        descents = self._full_runs(characteristics, characteristics.ascending_runs - 1)
+        best = min(costs.values())
+        if (descents <= max(1, n // self.NATURAL_RUN_RATIO) and
+                floor + descents * model["insertion_shift"] < best and
+                self._sampled_insertion_cost(characteristics) < best):
+            costs[SortStrategy.INSERTION_SORT] = self._insertion_cost(characteristics)
+        return costs
+    
+    def _sampled_insertion_cost(self, characteristics: InputCharacteristics) -> float:
+        n = characteristics.size
+        if (characteristics._presortedness is not None or getattr(characteristics, "sampled", False) or
+                characteristics.presortedness_mode != "inversions" or n <= self.INSERTION_SAMPLE_SIZE):
+            return 0.0
+        sample = SampledCharacteristics(characteristics._data, budget=self.INSERTION_SAMPLE_SIZE)
+        inversions = (1 - min(1.0, sample.presortedness + sample.presortedness_error)) * n * (n - 1) / 2
+        return n * self.COST_MODEL["insertion_element"] + inversions * self.COST_MODEL["insertion_shift"]
+    
+    def _full_runs(self, characteristics: InputCharacteristics, runs: int) -> float:
+        if getattr(characteristics, "sampled", False):
+            return runs * characteristics.size / characteristics.sample_size
+        return runs
+    
+    def _insertion_cost(self, characteristics: InputCharacteristics) -> float:
+        n = characteristics.size
+        inversions = (1 - characteristics.presortedness) * n * (n - 1) / 2
+        return (n * self.COST_MODEL["insertion_element"] +
+                inversions * self.COST_MODEL["insertion_shift"])
+    
+    def _prediction_costs(self, characteristics: InputCharacteristics,
+                          strategy: SortStrategy) -> Dict[SortStrategy, float]:
+        costs = self._predict_costs(characteristics)
+        if strategy == SortStrategy.INSERTION_SORT and strategy not in costs:
+            costs[strategy] = self._insertion_cost(characteristics)
+        return costs
+    
+    def _record_prediction(self, costs: Dict[SortStrategy, float], strategy: SortStrategy,
+                           elapsed: float):
+        if strategy == SortStrategy.QUICK_SORT:
+            strategy = SortStrategy.HYBRID
+        predicted = costs[strategy]
+        self.stats["predicted_costs"] = {key.value: cost for key, cost in costs.items()}
+        self.stats["predicted_time"] = predicted
+        self.stats["actual_time"] = elapsed
+        self.stats["prediction_ratio"] = elapsed / predicted if predicted > 0 else float("inf")
+    
+    def _select_selection_strategy(self, characteristics: InputCharacteristics,
+                                   k: int) -> SortStrategy:
+        n = characteristics.size
+        min_val, max_val = characteristics.data_range
+        if max_val - min_val + 1 <= n * self.COUNTING_RANGE_RATIO:
+            return SortStrategy.COUNTING_SELECT
+        
+        if (k * self.HEAP_SELECT_RATIO <= n or
+                self._full_runs(characteristics, characteristics.ascending_runs) * self.NATURAL_RUN_RATIO <= n):
+            return SortStrategy.HEAP_SELECT
+        
+        return SortStrategy.INTROSELECT
     
     def _adaptive_sort(self, data: List[int], left: int, right: int, 
-                      characteristics: InputCharacteristics) -> List[int]:
+                      characteristics: InputCharacteristics,
+                      budget: Optional[List[int]] = None) -> List[int]:
         size = right - left
         
         if size <= 1:
             return data
         
         if size <= self.INSERTION_THRESHOLD:
-            return self._insertion_sort(data, left, right)
+            return self._small_sort(data, left, right)
         
-        subset = data[left:right]
-        local_chars = InputCharacteristics(subset)
-        strategy = self._select_strategy(local_chars)
+        if budget is None:
+            budget = [self._segment_budget(size)]
+        
+        summary = None
+        if left == 0 and right == len(data):
+            local_chars = characteristics
+            block = self._summary_block(local_chars, budget[0])
+            if block is not None:
+                summary = local_chars.summarize(block)
+        else:
+            block = self._summary_block(None, budget[0], size)
+            if block is not None:
+                summary = BlockSummary(data, left, right, block, self.presortedness_mode)
+                local_chars = summary.segment(left, right)
+            else:
+                local_chars = self._analyze(data[left:right])
+        
+        if summary is None:
+            return self._run_strategy(data, left, right, local_chars,
+                                      self._select_strategy(local_chars))
+        budget[0] -= size
+        self.stats["analyzed_elements"] += size
+        return self._sort_segment(data, left, right, local_chars, summary, budget)
+    
+    def _segment_budget(self, size: int) -> int:
+        if self.analysis_budget is not None:
+            return self.analysis_budget
+        return self.SEGMENT_ANALYSIS_FACTOR * size
+    
+    def _summary_block(self, characteristics: Optional[InputCharacteristics], budget: int,
+                       size: Optional[int] = None) -> Optional[int]:
+        if characteristics is not None:
+            size = characteristics.size
+            if (characteristics._descents is not None and
+                    min(characteristics.ascending_runs, characteristics.descending_runs) == 1):
+                return None
+        if size < 2 * self.SEGMENT_MIN_SIZE or budget < 2 * size:
+            return None
+        return max(self.SEGMENT_BLOCK_SIZE, size // self.SEGMENT_BLOCKS)
+    
+    def _sort_segment(self, data: List[int], left: int, right: int,
+                      characteristics: InputCharacteristics, summary: BlockSummary,
+                      budget: List[int]) -> List[int]:
+        size = right - left
+        blocks = -(-size // summary.block)
+        if (size >= 2 * self.SEGMENT_MIN_SIZE and budget[0] >= blocks and
+                min(characteristics.ascending_runs, characteristics.descending_runs) > 1):
+            budget[0] -= blocks
+            self.stats["analyzed_elements"] += blocks
+            split = self._best_split(characteristics,
+                                     summary.splits(left, right, self.SEGMENT_MIN_SIZE))
+            if split is not None:
+                head, tail = split
+                self._sort_segment(data, left, tail.left, head, summary, budget)
+                self._sort_segment(data, tail.left, right, tail, summary, budget)
+                self._merge_adjacent(data, left, tail.left, right)
+                return data
         
+        strategy = self._select_strategy(characteristics)
+        if size < len(data):
+            self._log_strategy(strategy, left, right)
+        return self._run_strategy(data, left, right, characteristics, strategy)
+    
+    def _best_split(self, characteristics: InputCharacteristics, splits):
+        best = min(self._predict_costs(characteristics).values())
+        merge = characteristics.size * self.COST_MODEL["run_merge"]
+        chosen = None
+        for head, tail in splits:
+            cost = merge + min(self._predict_costs(head).values())
+            if cost < best:
+                cost += min(self._predict_costs(tail).values())
+                if cost < best:
+                    best, chosen = cost, (head, tail)
+        return chosen
+    
+    def _run_strategy(self, data: List[int], left: int, right: int,
+                      characteristics: InputCharacteristics, strategy: SortStrategy) -> List[int]:
         if strategy == SortStrategy.INSERTION_SORT:
-            return self._insertion_sort(data, left, right)
+            return self._bounded_insertion_sort(data, left, right)
         elif strategy == SortStrategy.RADIX_SORT:
-            sorted_subset = self._radix_sort(subset)
+            sorted_subset = self._radix_sort(data[left:right])
             data[left:right] = sorted_subset
             return data
+        elif strategy == SortStrategy.NATURAL_MERGE:
+            return self._natural_merge_sort(data, left, right)
+        elif strategy == SortStrategy.COUNTING_SORT:
+            data[left:right] = self._counting_sort(data[left:right], *characteristics.data_range)
+            return data
+        elif strategy in (SortStrategy.HYBRID, SortStrategy.QUICK_SORT):
+            return self._introsort(data, left, right)
         else:
             return self._merge_sort(data, left, right)
     
     def _insertion_sort(self, data: List[int], left: int, right: int) -> List[int]:
+        if not self._count_ops:
+            for i in range(left + 1, right):
+                key = data[i]
+                j = i - 1
+                while j >= left and data[j] > key:
+                    data[j + 1] = data[j]
+                    j -= 1
+                data[j + 1] = key
+            return data
+        
+        comparisons = swaps = 0
         for i in range(left + 1, right):
             key = data[i]
             j = i - 1
             while j >= left and data[j] > key:
-                self.stats["comparisons"] += 1
+                comparisons += 1
                 data[j + 1] = data[j]
-                self.stats["swaps"] += 1
+                swaps += 1
                 j -= 1
             if j >= left:
-                self.stats["comparisons"] += 1
+                comparisons += 1
             data[j + 1] = key
+        
+        self._record("insertion", left, right, comparisons, swaps)
         return data
     
-    def _merge_sort(self, data: List[int], left: int, right: int) -> List[int]:
+    def _bounded_insertion_sort(self, data: List[int], left: int, right: int) -> List[int]:
+        size = right - left
+        budget = self.INSERTION_SHIFT_FACTOR * size * max(1, size.bit_length())
+        shifts = placed = 0
+        for i in range(left + 1, right):
+            key = data[i]
+            j = i - 1
+            while j >= left and data[j] > key:
+                data[j + 1] = data[j]
+                j -= 1
+            data[j + 1] = key
+            shifts += i - 1 - j
+            placed += j >= left
+            if shifts > budget:
+                self._record("insertion", left, i + 1, shifts + placed, shifts)
+                self.stats["insertion_bailouts"] += 1
+                self._log_strategy(SortStrategy.NATURAL_MERGE, i + 1, right)
+                self._natural_merge_sort(data, i + 1, right)
+                self._merge_adjacent(data, left, i + 1, right)
+                return data
+        
+        self._record("insertion", left, right, shifts + placed, shifts)
+        return data
+    
+    def _natural_merge_sort(self, data: List[int], left: int, right: int) -> List[int]:
+        min_run = self._min_run_length(right - left)
+        stack = []
+        lo = left
+        
+        while lo < right:
+            hi = self._next_run(data, lo, right)
+            if hi - lo < min_run:
+                forced = min(lo + min_run, right)
+                self._binary_insertion_sort(data, lo, forced, hi)
+                hi = forced
+            stack.append((lo, hi - lo))
+            self._merge_collapse(data, stack)
+            lo = hi
+        
+        while len(stack) > 1:
+            self._merge_at(data, stack, len(stack) - 2)
+        
+        return data
+    
+    def _min_run_length(self, n: int) -> int:
+        extra = 0
+        while n >= 64:
+            extra |= n & 1
+            n >>= 1
+        return n + extra
+    
+    def _next_run(self, data: List[int], lo: int, right: int) -> int:
+        hi = lo + 1
+        if hi == right:
+            return hi
+        
+        swaps = 0
+        if data[hi] < data[lo]:
+            while hi + 1 < right and data[hi + 1] < data[hi]:
+                hi += 1
+            hi += 1
+            data[lo:hi] = data[lo:hi][::-1]
+            swaps = (hi - lo) // 2
+        else:
+            while hi + 1 < right and data[hi + 1] >= data[hi]:
+                hi += 1
+            hi += 1
+        
+        self._record("run", lo, hi, hi - lo, swaps)
+        return hi
+    
+    def _binary_insertion_sort(self, data: List[int], left: int, right: int,
+                               start: int) -> List[int]:
         if right - left <= 1:
             return data
         
-        if right - left <= self.INSERTION_THRESHOLD:
+        start = max(start, left + 1)
+        run = data[left:start]
+        if isinstance(data, memoryview):
+            run = run.tolist()
+        
+        if not self._count_ops:
+            for key in data[start:right]:
+                insort(run, key)
+        else:
+            comparisons = swaps = 0
+            for key in data[start:right]:
+                pos = bisect_right(run, key)
+                comparisons += len(run).bit_length()
+                swaps += len(run) - pos
+                run.insert(pos, key)
+            self._record("binary_insertion", left, right, comparisons, swaps)
+        
+        data[left:right] = array(data.format, run) if isinstance(data, memoryview) else run
+        return data
+    
+    def _small_sort(self, data: List[int], left: int, right: int) -> List[int]:
+        size = right - left
+        if size < self.NETWORK_MIN_SIZE:
             return self._insertion_sort(data, left, right)
+        if size > self.NETWORK_MAX_SIZE or not isinstance(data, list):
+            return self._binary_insertion_sort(data, left, right, left + 1)
         
-        mid = (left + right) // 2
+        if self._count_ops:
+            swaps = _COUNTED_NETWORK_KERNELS[size](data, left)
+            self._record("network", left, right, len(SORTING_NETWORKS[size]), swaps)
+        else:
+            _NETWORK_KERNELS[size](data, left)
+        return data
+    
+    def _merge_collapse(self, data: List[int], stack: List[Tuple[int, int]]):
+        while len(stack) > 1:
+            n = len(stack) - 2
+            if ((n > 0 and stack[n - 1][1] <= stack[n][1] + stack[n + 1][1]) or
+                    (n > 1 and stack[n - 2][1] <= stack[n - 1][1] + stack[n][1])):
+                if stack[n - 1][1] < stack[n + 1][1]:
+                    n -= 1
+            elif stack[n][1] > stack[n + 1][1]:
+                break
+            self._merge_at(data, stack, n)
+    
+    def _merge_at(self, data: List[int], stack: List[Tuple[int, int]], i: int):
+        base, len1 = stack[i]
+        len2 = stack[i + 1][1]
+        stack[i] = (base, len1 + len2)
+        del stack[i + 1]
         
-        data = self._merge_sort(data, left, mid)
-        data = self._merge_sort(data, mid, right)
+        self._merge_adjacent(data, base, base + len1, base + len1 + len2)
+    
+    def _merge_adjacent(self, data: List[int], base: int, mid: int, right: int):
+        if base == mid or mid == right:
+            return
         
-        return self._merge(data, left, mid, right)
+        start = bisect_right(data, data[mid], base, mid)
+        if start == mid:
+            return
+        end = bisect_left(data, data[mid - 1], mid, right)
+        self._galloping_merge(data, start, mid, end,
+                              (mid - base).bit_length() + (right - mid).bit_length())
     
-    def _merge(self, data: List[int], left: int, mid: int, right: int) -> List[int]:
-        left_part = data[left:mid]
-        right_part = data[mid:right]
+    def _galloping_merge(self, data: List[int], left: int, mid: int, right: int,
+                         comparisons: int = 0):
+        tmp = _typed_copy(data[left:mid]) if isinstance(data, memoryview) else data[left:mid]
+        n1 = len(tmp)
+        i, j, k = 0, mid, left
+        min_gallop = self.MIN_GALLOP
         
-        i = j = 0
-        k = left
+        while i < n1 and j < right:
+            count1 = count2 = 0
+            while i < n1 and j < right:
+                comparisons += 1
+                if data[j] < tmp[i]:
+                    data[k] = data[j]
+                    j += 1
+                    count2 += 1
+                    count1 = 0
+                else:
+                    data[k] = tmp[i]
+                    i += 1
+                    count1 += 1
+                    count2 = 0
+                k += 1
+                if count1 >= min_gallop or count2 >= min_gallop:
+                    break
+            
+            while i < n1 and j < right:
+                end = bisect_right(tmp, data[j], i)
+                count1 = end - i
+                data[k:k + count1] = tmp[i:end]
+                k += count1
+                i = end
+                if i == n1:
+                    break
+                
+                end = bisect_left(data, tmp[i], j, right)
+                count2 = end - j
+                data[k:k + count2] = data[j:end]
+                k += count2
+                j = end
+                comparisons += (n1 - i).bit_length() + (right - j).bit_length()
+                if count1 < min_gallop and count2 < min_gallop:
+                    break
         
-        while i < len(left_part) and j < len(right_part):
-            self.stats["comparisons"] += 1
-            if left_part[i] <= right_part[j]:
-                data[k] = left_part[i]
-                i += 1
+        if i < n1:
+            data[k:k + n1 - i] = tmp[i:]
+        
+        self._record("gallop", left, right, comparisons, (mid - left) + (j - mid))
+    
+    def _introsort(self, data: List[int], left: int, right: int) -> List[int]:
+        threshold = self.INSERTION_THRESHOLD
+        stack = [(left, right, 2 * (right - left).bit_length())]
+        
+        while stack:
+            lo, hi, depth = stack.pop()
+            while hi - lo > threshold:
+                if depth == 0:
+                    self._heap_sort(data, lo, hi)
+                    break
+                
+                pivot_index = self._choose_pivot(data, lo, hi)
+                if lo > left and not data[lo - 1] < data[pivot_index]:
+                    lo = self._partition_equal(data, lo, hi, data[pivot_index])
+                    continue
+                
+                depth -= 1
+                mid = self._partition(data, lo, hi, pivot_index)
+                smaller = min(mid - lo, hi - mid - 1)
+                if smaller < (hi - lo) >> 3:
+                    depth -= 1
+                    self._break_patterns(data, lo, mid, hi)
+                
+                if mid - lo < hi - mid:
+                    stack.append((mid + 1, hi, depth))
+                    hi = mid
+                else:
+                    stack.append((lo, mid, depth))
+                    lo = mid + 1
             else:
-                data[k] = right_part[j]
-                j += 1
-            self.stats["swaps"] += 1
-            k += 1
+                self._small_sort(data, lo, hi)
+        
+        return data
+    
+    def _choose_pivot(self, data: List[int], lo: int, hi: int) -> int:
+        size = hi - lo
+        mid = lo + size // 2
+        if size < self.NINTHER_THRESHOLD:
+            self._record("pivot", lo, hi, 3, 0)
+            return self._median_of_three(data, lo, mid, hi - 1)
+        
+        step = size // 8
+        self._record("pivot", lo, hi, 12, 0)
+        return self._median_of_three(
+            data,
+            self._median_of_three(data, lo, lo + step, lo + 2 * step),
+            self._median_of_three(data, mid - step, mid, mid + step),
+            self._median_of_three(data, hi - 1 - 2 * step, hi - 1 - step, hi - 1))
+    
+    def _median_of_three(self, data: List[int], a: int, b: int, c: int) -> int:
+        if data[b] < data[a]:
+            a, b = b, a
+        if data[c] < data[b]:
+            b = c
+            if data[b] < data[a]:
+                b = a
+        return b
+    
+    def _partition(self, data: List[int], lo: int, hi: int, pivot_index: int) -> int:
+        data[lo], data[pivot_index] = data[pivot_index], data[lo]
+        pivot = data[lo]
+        i, j = lo + 1, hi - 1
+        comparisons = swaps = 0
         
-        while i < len(left_part):
-            data[k] = left_part[i]
+        while True:
+            while i <= j and data[i] < pivot:
+                i += 1
+            while i <= j and pivot < data[j]:
+                j -= 1
+            comparisons += 2
+            if i >= j:
+                break
+            data[i], data[j] = data[j], data[i]
+            swaps += 1
             i += 1
-            k += 1
-            self.stats["swaps"] += 1
+            j -= 1
+        
+        data[lo], data[j] = data[j], data[lo]
+        self._record("partition", lo, hi, comparisons + (hi - lo), swaps + 1)
+        return j
+    
+    def _partition_equal(self, data: List[int], lo: int, hi: int, pivot: int) -> int:
+        i, j = lo, hi - 1
+        swaps = 0
         
-        while j < len(right_part):
-            data[k] = right_part[j]
-            j += 1
-            k += 1
-            self.stats["swaps"] += 1
+        while True:
+            while i <= j and not pivot < data[i]:
+                i += 1
+            while i <= j and pivot < data[j]:
+                j -= 1
+            if i >= j:
+                break
+            data[i], data[j] = data[j], data[i]
+            swaps += 1
+            i += 1
+            j -= 1
         
+        self._record("partition_equal", lo, hi, hi - lo, swaps)
+        return i
+    
+    def _break_patterns(self, data: List[int], lo: int, mid: int, hi: int):
+        left_size = mid - lo
+        right_size = hi - mid - 1
+        if left_size >= self.INSERTION_THRESHOLD:
+            quarter = left_size // 4
+            data[lo], data[lo + quarter] = data[lo + quarter], data[lo]
+            data[mid - 1], data[mid - quarter] = data[mid - quarter], data[mid - 1]
+        if right_size >= self.INSERTION_THRESHOLD:
+            quarter = right_size // 4
+            data[mid + 1], data[mid + 1 + quarter] = data[mid + 1 + quarter], data[mid + 1]
+            data[hi - 1], data[hi - quarter] = data[hi - quarter], data[hi - 1]
+    
+    def _heap_sort(self, data: List[int], lo: int, hi: int) -> List[int]:
+        n = hi - lo
+        for start in range(n // 2 - 1, -1, -1):
+            self._sift_down(data, lo, start, n)
+        for end in range(n - 1, 0, -1):
+            data[lo], data[lo + end] = data[lo + end], data[lo]
+            self._sift_down(data, lo, 0, end)
+        self._record("heap", lo, hi, 0, n)
         return data
     
-    def _radix_sort(self, data: List[int]) -> List[int]:
-        if not data:
+    def _sift_down(self, data: List[int], base: int, root: int, end: int):
+        value = data[base + root]
+        child = 2 * root + 1
+        while child < end:
+            if child + 1 < end and data[base + child] < data[base + child + 1]:
+                child += 1
+            if not value < data[base + child]:
+                break
+            data[base + root] = data[base + child]
+            root = child
+            child = 2 * root + 1
+        data[base + root] = value
+    
+    def _merge_sort(self, data: List[int], left: int, right: int) -> List[int]:
+        n = right - left
+        if n <= 1:
             return data
         
-        max_val = max(data)
-        exp = 1
+        if n <= self.INSERTION_THRESHOLD:
+            return self._small_sort(data, left, right)
         
-        while max_val // exp > 0:
-            data = self._counting_sort_by_digit(data, exp)
-            exp *= 10
+        src = data if left == 0 and right == len(data) else data[left:right]
+        width = self.INSERTION_THRESHOLD
+        for lo in range(0, n, width):
+            self._small_sort(src, lo, min(lo + width, n))
         
+        dst = [None] * n
+        while width < n:
+            for lo in range(0, n, 2 * width):
+                mid = min(lo + width, n)
+                hi = min(lo + 2 * width, n)
+                if mid >= hi or src[mid - 1] <= src[mid]:
+                    dst[lo:hi] = src[lo:hi]
+                else:
+                    self._merge_into(src, dst, lo, mid, hi)
+            src, dst = dst, src
+            width *= 2
+        
+        if src is not data:
+            data[left:right] = src
         return data
     
-    def _counting_sort_by_digit(self, data: List[int], exp: int) -> List[int]:
+    def _merge_into(self, src: List[int], dst: List[int], lo: int, mid: int, hi: int):
+        i, j, k = lo, mid, lo
+        a, b = src[i], src[j]
+        
+        while True:
+            if a <= b:
+                dst[k] = a
+                i += 1
+                k += 1
+                if i == mid:
+                    dst[k:hi] = src[j:hi]
+                    break
+                a = src[i]
+            else:
+                dst[k] = b
+                j += 1
+                k += 1
+                if j == hi:
+                    dst[k:hi] = src[i:mid]
+                    break
+                b = src[j]
+        
+        self._record("merge", lo, hi, k - lo, hi - lo)
+    
+    def _sort_array(self, data: "np.ndarray", strategy: SortStrategy,
+                    characteristics: InputCharacteristics) -> "np.ndarray":
+        n = data.size
+        if strategy == SortStrategy.COUNTING_SORT:
+            lo, hi = characteristics.data_range
+            counts = np.bincount(_array_offsets(data, lo), minlength=hi - lo + 1)
+            values = np.arange(lo, hi + 1).astype(data.dtype)
+            result = np.repeat(values, counts)
+        elif strategy in (SortStrategy.HYBRID, SortStrategy.QUICK_SORT):
+            data.sort(kind="quicksort")
+            result = data
+        else:
+            data.sort(kind="stable")
+            result = data
+        
+        self._record("array", 0, n, n, n)
+        return result
+    
+    def _counting_sort(self, data: List[int], lo: int, hi: int) -> List[int]:
+        counts = Counter(data)
+        get = counts.get
+        result = []
+        for value in range(lo, hi + 1):
+            count = get(value)
+            if count:
+                result.extend(repeat(value, count))
+        
+        self._record("counting", 0, len(data), len(data), len(data))
+        return result
+    
+    def _counting_sort_into(self, data, out, lo: int, hi: int):
+        counts = Counter(data)
+        get = counts.get
+        typecode = out.format if isinstance(out, memoryview) else out.typecode
+        pos = 0
+        for value in range(lo, hi + 1):
+            count = get(value)
+            if count:
+                out[pos:pos + count] = array(typecode, (value,)) * count
+                pos += count
+        
+        self._record("counting", 0, len(data), len(data), len(data))
+        return out
+    
+    def _counting_select(self, data: List[int], k: int, lo: int, hi: int) -> List[int]:
+        counts = Counter(data)
+        get = counts.get
+        result = []
+        for value in range(lo, hi + 1):
+            count = get(value)
+            if count:
+                result.extend(repeat(value, min(count, k - len(result))))
+                if len(result) == k:
+                    break
+        
+        self._record("counting_select", 0, len(data), len(data), k)
+        return result
+    
+    def _heap_select(self, data: List[int], k: int) -> List[int]:
+        heap = [-value for value in islice(data, k)]
+        heapq.heapify(heap)
+        top = -heap[0]
+        replaced = 0
+        for value in islice(data, k, None):
+            if value < top:
+                heapq.heapreplace(heap, -value)
+                top = -heap[0]
+                replaced += 1
+        
+        self._record("heap_select", 0, len(data),
+                     len(data) + replaced * max(1, k.bit_length()), replaced)
+        return [-value for value in heap]
+    
+    def _introselect(self, data: List[int], left: int, right: int, nth: int) -> List[int]:
+        lo, hi = left, right
+        depth = 2 * (right - left).bit_length()
+        while hi - lo > self.INSERTION_THRESHOLD:
+            if depth == 0:
+                return self._heap_sort(data, lo, hi)
+            
+            depth -= 1
+            mid = self._partition(data, lo, hi, self._choose_pivot(data, lo, hi))
+            if mid == nth:
+                return data
+            if nth < mid:
+                hi = mid
+            else:
+                lo = mid + 1
+        
+        return self._small_sort(data, lo, hi)
+    
+    def _sort_buffer_in_place(self, data, strategy: SortStrategy,
+                              characteristics: InputCharacteristics):
+        n = len(data)
+        exact = not getattr(characteristics, "sampled", False)
+        if strategy == SortStrategy.INSERTION_SORT:
+            self._bounded_insertion_sort(data, 0, n)
+        elif strategy == SortStrategy.NATURAL_MERGE and exact and characteristics.ascending_runs == 1:
+            return
+        elif (strategy == SortStrategy.NATURAL_MERGE and exact and
+              characteristics.descending_runs == 1 and characteristics.ascending_runs == n):
+            reversed_copy = _typed_copy(data)
+            reversed_copy.reverse()
+            data[:] = reversed_copy
+            self._record("reverse", 0, n, 0, n // 2)
+        else:
+            self._introsort(data, 0, n)
+    
+    def _radix_plan(self, value_range: int, size: int) -> Tuple[int, int]:
+        key_bits = max(1, value_range.bit_length())
+        if self.radix_bits is not None:
+            return self.radix_bits, -(-key_bits // self.radix_bits)
+        
+        best = None
+        for bits in self.RADIX_DIGIT_BITS:
+            passes = -(-key_bits // bits)
+            cost = passes * (size + (1 << bits))
+            if best is None or cost < best[0]:
+                best = (cost, bits, passes)
+        return best[1], best[2]
+    
+    def _radix_sort(self, data: List[int], out=None) -> List[int]:
         n = len(data)
-        output = [0] * n
-        count = [0] * 10
+        lo, hi = (min(data), max(data)) if n else (0, 0)
+        if lo == hi:
+            if out is not None and out is not data:
+                out[:] = data
+            return data if out is None else out
         
-        for i in range(n):
-            index = (data[i] // exp) % 10
-            count[index] += 1
-            self.stats["comparisons"] += 1
+        bits, passes = self._radix_plan(hi - lo, n)
+        mask = (1 << bits) - 1
+        digits = [(p * bits, [0] * (mask + 1)) for p in range(passes)]
         
-        for i in range(1, 10):
-            count[i] += count[i - 1]
+        for value in data:
+            key = value - lo
+            for shift, counts in digits:
+                counts[(key >> shift) & mask] += 1
         
-        for i in range(n - 1, -1, -1):
-            index = (data[i] // exp) % 10
-            output[count[index] - 1] = data[i]
-            count[index] -= 1
-            self.stats["swaps"] += 1
+        if out is None:
+            targets = ([0] * n, data)
+        elif out is data:
+            targets = (_typed_copy(data), data)
+        else:
+            targets = (out, _typed_copy(out))
+        
+        src = data
+        moved = 0
+        for shift, counts in digits:
+            if max(counts) == n:
+                continue
+            
+            total = 0
+            for digit in range(mask + 1):
+                count = counts[digit]
+                counts[digit] = total
+                total += count
+            
+            dst = targets[moved // n % 2]
+            for value in src:
+                digit = ((value - lo) >> shift) & mask
+                dst[counts[digit]] = value
+                counts[digit] += 1
+            src = dst
+            moved += n
         
-        return output
+        self._record("radix", 0, n, n, moved)
+        if out is None:
+            return src
+        if src is not out:
+            out[:] = src
+        return out
     
     def _log_strategy(self, strategy: SortStrategy, left: int, right: int):
         self.stats["strategy_switches"].append({
@@ -299,6 +2151,9 @@ class SmartSort:
         print(f"Execution Time: {self.stats['execution_time']:.6f} seconds")
         print(f"Comparisons: {self.stats['comparisons']}")
         print(f"Swaps: {self.stats['swaps']}")
+        if "predicted_time" in self.stats:
+            print(f"Predicted Kernel Time: {self.stats['predicted_time']:.6f} seconds")
+            print(f"Actual Kernel Time: {self.stats['actual_time']:.6f} seconds")
         print(f"\nStrategy Usage:")
         
         strategy_counts = {}
@@ -309,10 +2164,421 @@ class SmartSort:
         for strategy, count in strategy_counts.items():
             print(f"  {strategy}: {count} time(s)")
     
+    def _worker_options(self) -> Dict[str, Any]:
+        return {
+            "presortedness_mode": self.presortedness_mode,
+            "analysis_budget": self.analysis_budget,
+            "radix_bits": self.radix_bits,
+            "collect_stats": self.collect_stats,
+            "profile": self.profile,
+            "selection": self.selection
+        }
+    
+    def _absorb_stats(self, stats: Dict[str, Any], offset: int):
+        self.stats["comparisons"] += stats["comparisons"]
+        self.stats["swaps"] += stats["swaps"]
+        self.stats["analyzed_elements"] += stats.get("analyzed_elements", 0)
+        self.stats["insertion_bailouts"] += stats.get("insertion_bailouts", 0)
+        for key in ("strategy_switches", "trace"):
+            for event in stats.get(key, ()):
+                left, right = event["range"]
+                self.stats[key].append(dict(event, range=(left + offset, right + offset)))
+    
     def get_stats(self) -> Dict[str, Any]:
         return self.stats.copy()
 
 
+def _sort_shared_chunk(name: str, start: int, stop: int, options: Dict[str, Any]) -> Dict[str, Any]:
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        with shm.buf.cast("q") as view, view[start:stop] as chunk:
+            sorter = SmartSort(**options)
+            sorter.sort_buffer(chunk)
+        return sorter.get_stats()
+    finally:
+        shm.close()
+
+
+def _merge_shared_partition(source_name: str, target_name: str, runs: List[Tuple[int, int]],
+                            offset: int, options: Dict[str, Any]) -> Dict[str, Any]:
+    source = shared_memory.SharedMemory(name=source_name)
+    target = shared_memory.SharedMemory(name=target_name)
+    try:
+        sorter = SmartSort(**options)
+        with source.buf.cast("q") as view:
+            merged = []
+            for start, stop in runs:
+                merged.extend(view[start:stop])
+        
+        size = len(merged)
+        if size:
+            sorter._log_strategy(SortStrategy.NATURAL_MERGE, 0, size)
+            sorter._natural_merge_sort(merged, 0, size)
+            with target.buf.cast("q") as view:
+                view[offset:offset + size] = array("q", merged)
+        return sorter.get_stats()
+    finally:
+        source.close()
+        target.close()
+
+
+class ParallelSmartSort(SmartSort):
+    PARALLEL_THRESHOLD = 65536
+    SPLITTER_OVERSAMPLE = 32
+    
+    def __init__(self, workers: Optional[int] = None, verbose: bool = False,
+                 presortedness_mode: str = "inversions", analysis_budget: Optional[int] = None,
+                 radix_bits: Optional[int] = None, collect_stats: str = "counters",
+                 profile: Optional[str] = None, selection: str = "cost"):
+        super().__init__(verbose=verbose, presortedness_mode=presortedness_mode,
+                         analysis_budget=analysis_budget, radix_bits=radix_bits,
+                         collect_stats=collect_stats, profile=profile,
+                         selection=selection)
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.workers = workers
+    
+    def sort(self, data: List[int], key: Optional[Callable[[Any], Any]] = None,
+             reverse: bool = False) -> List[int]:
+        if (key is not None or reverse or self.workers == 1 or isinstance(data, array) or
+                (np is not None and isinstance(data, np.ndarray)) or
+                len(data) < self.PARALLEL_THRESHOLD):
+            return super().sort(data, key=key, reverse=reverse)
+        
+        try:
+            source = array("q", data)
+        except (TypeError, OverflowError):
+            return super().sort(data)
+        
+        start_time = time.time()
+        self._reset_stats()
+        
+        result = self._parallel_sort(source)
+        
+        self.stats["execution_time"] = time.time() - start_time
+        
+        if self.verbose:
+            self._print_stats()
+        
+        return result
+    
+    def _parallel_sort(self, source: array) -> List[int]:
+        n = len(source)
+        options = self._worker_options()
+        chunk = -(-n // self.workers)
+        bounds = [(start, min(start + chunk, n)) for start in range(0, n, chunk)]
+        
+        data_shm = shared_memory.SharedMemory(create=True, size=n * source.itemsize)
+        out_shm = shared_memory.SharedMemory(create=True, size=n * source.itemsize)
+        try:
+            with data_shm.buf.cast("q") as view, view[:n] as data:
+                data[:] = source
+            
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                futures = [pool.submit(_sort_shared_chunk, data_shm.name, start, stop, options)
+                           for start, stop in bounds]
+                for (start, _), future in zip(bounds, futures):
+                    self._absorb_stats(future.result(), start)
+                
+                with data_shm.buf.cast("q") as view:
+                    partitions = self._partition_runs(view, bounds)
+                
+                futures = [pool.submit(_merge_shared_partition, data_shm.name, out_shm.name,
+                                       runs, offset, options)
+                           for runs, offset in partitions]
+                for (_, offset), future in zip(partitions, futures):
+                    self._absorb_stats(future.result(), offset)
+            
+            with out_shm.buf.cast("q") as view, view[:n] as out:
+                return out.tolist()
+        finally:
+            for shm in (data_shm, out_shm):
+                shm.close()
+                shm.unlink()
+    
+    def _choose_splitters(self, view, bounds: List[Tuple[int, int]]) -> List[int]:
+        samples = []
+        for start, stop in bounds:
+            step = max(1, (stop - start) // self.SPLITTER_OVERSAMPLE)
+            samples.extend(view[start:stop:step])
+        
+        samples = SmartSort(**self._worker_options()).sort(samples)
+        parts = len(bounds)
+        return [samples[len(samples) * i // parts] for i in range(1, parts)]
+    
+    def _partition_runs(self, view, bounds: List[Tuple[int, int]]):
+        splitters = self._choose_splitters(view, bounds)
+        cuts = []
+        for start, stop in bounds:
+            cut = [start]
+            for splitter in splitters:
+                cut.append(bisect_left(view, splitter, cut[-1], stop))
+            cut.append(stop)
+            cuts.append(cut)
+        
+        partitions = []
+        offset = 0
+        for p in range(len(splitters) + 1):
+            runs = [(cut[p], cut[p + 1]) for cut in cuts if cut[p] < cut[p + 1]]
+            partitions.append((runs, offset))
+            offset += sum(stop - start for start, stop in runs)
+        return partitions
+
+
+class ExternalSmartSort(SmartSort):
+    MIN_CHUNK_ITEMS = 1024
+    
+    def __init__(self, memory_budget: int = 64 * 1024 * 1024, max_open_files: int = 64,
+                 read_ahead: Optional[int] = None, typecode: str = "q",
+                 temp_dir: Optional[str] = None, verbose: bool = False,
+                 presortedness_mode: str = "inversions", analysis_budget: Optional[int] = None,
+                 radix_bits: Optional[int] = None, collect_stats: str = "counters",
+                 profile: Optional[str] = None, selection: str = "cost"):
+        super().__init__(verbose=verbose, presortedness_mode=presortedness_mode,
+                         analysis_budget=analysis_budget, radix_bits=radix_bits,
+                         collect_stats=collect_stats, profile=profile,
+                         selection=selection)
+        if typecode not in BUFFER_FORMATS:
+            raise ValueError(f"typecode must be one of {BUFFER_FORMATS!r}")
+        if max_open_files < 2:
+            raise ValueError("max_open_files must be at least 2")
+        if read_ahead is not None and read_ahead < 1:
+            raise ValueError("read_ahead must be at least 1")
+        self.typecode = typecode
+        self.itemsize = array(typecode).itemsize
+        self.memory_budget = memory_budget
+        copies = 3 if presortedness_mode == "inversions" and analysis_budget is None else 2
+        self.chunk_items = max(self.MIN_CHUNK_ITEMS, memory_budget // (copies * self.itemsize))
+        self.max_open_files = max_open_files
+        self.read_ahead = read_ahead
+        self.temp_dir = temp_dir
+    
+    def sort_file(self, input_path: str, output_path: str) -> int:
+        if os.path.getsize(input_path) % self.itemsize:
+            raise ValueError(f"{input_path} is not a whole number of {self.typecode!r} items")
+        
+        start_time = time.time()
+        self._reset_stats()
+        
+        with tempfile.TemporaryDirectory(dir=self.temp_dir) as spill_dir:
+            runs, total = self._spill_runs(input_path, spill_dir)
+            passes = 0
+            while len(runs) > self.max_open_files:
+                groups = [runs[i:i + self.max_open_files]
+                          for i in range(0, len(runs), self.max_open_files)]
+                runs = [self._merge_runs(group, os.path.join(spill_dir, f"pass{passes}-{i}.run"))
+                        for i, group in enumerate(groups)]
+                passes += 1
+            
+            if not runs:
+                open(output_path, "wb").close()
+            elif len(runs) == 1:
+                shutil.move(runs[0], output_path)
+            else:
+                self._merge_runs(runs, output_path)
+                passes += 1
+        
+        self.stats["runs"] = -(-total // self.chunk_items)
+        self.stats["merge_passes"] = passes
+        self.stats["execution_time"] = time.time() - start_time
+        
+        if self.verbose:
+            self._print_stats()
+        
+        return total
+    
+    def _read_block(self, stream, count: int) -> array:
+        block = array(self.typecode)
+        try:
+            block.fromfile(stream, count)
+        except EOFError:
+            pass
+        return block
+    
+    def _spill_runs(self, input_path: str, spill_dir: str) -> Tuple[List[str], int]:
+        runs = []
+        total = 0
+        options = self._worker_options()
+        with open(input_path, "rb") as stream:
+            while True:
+                block = self._read_block(stream, self.chunk_items)
+                if not block:
+                    break
+                
+                sorter = SmartSort(**options)
+                sorter.sort_buffer(block)
+                self._absorb_stats(sorter.get_stats(), total)
+                
+                path = os.path.join(spill_dir, f"run{len(runs)}.run")
+                with open(path, "wb") as run:
+                    block.tofile(run)
+                runs.append(path)
+                total += len(block)
+        return runs, total
+    
+    def _read_run(self, path: str, count: int):
+        with open(path, "rb") as stream:
+            while True:
+                block = self._read_block(stream, count)
+                if not block:
+                    return
+                yield from block
+    
+    def _merge_runs(self, paths: List[str], output_path: str) -> str:
+        block = max(1, self.chunk_items // (len(paths) + 1))
+        if self.read_ahead is not None:
+            block = min(block, self.read_ahead)
+        
+        merged = heapq.merge(*(self._read_run(path, block) for path in paths))
+        written = 0
+        with open(output_path, "wb") as stream:
+            while True:
+                out = array(self.typecode, islice(merged, block))
+                if not out:
+                    break
+                out.tofile(stream)
+                written += len(out)
+        
+        for path in paths:
+            os.remove(path)
+        self._record("multiway_merge", 0, written,
+                     written * max(1, (len(paths) - 1).bit_length()), written)
+        return output_path
+
+
+class SortedAccumulator:
+    
+    def __init__(self, sorter: Optional[SmartSort] = None, buffer_size: int = 64,
+                 block_size: int = 1024):
+        if buffer_size < 1:
+            raise ValueError("buffer_size must be at least 1")
+        if block_size < 2:
+            raise ValueError("block_size must be at least 2")
+        self.sorter = sorter if sorter is not None else SmartSort(collect_stats="off")
+        self.buffer_size = buffer_size
+        self.block_size = block_size
+        self._buffer = []
+        self._blocks = []
+        self._maxes = []
+        self._offsets = [0]
+    
+    def add(self, value: int):
+        self._buffer.append(value)
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+    
+    def update(self, values):
+        values = iter(values)
+        while True:
+            room = self.buffer_size - len(self._buffer)
+            before = len(self._buffer)
+            self._buffer.extend(islice(values, room))
+            if len(self._buffer) - before < room:
+                return
+            self.flush()
+    
+    def flush(self):
+        if not self._buffer:
+            return
+        
+        batch = self.sorter.sort(self._buffer)
+        self._buffer = []
+        blocks, maxes = self._blocks, self._maxes
+        limit = 2 * self.block_size
+        if not blocks:
+            blocks.append(batch)
+            maxes.append(batch[-1])
+            oversized = len(batch) > limit
+        else:
+            oversized = False
+            i = 0
+            b = 0
+            while i < len(batch):
+                b = bisect_left(maxes, batch[i], b)
+                if b == len(blocks):
+                    b -= 1
+                    end = len(batch)
+                else:
+                    end = bisect_right(batch, maxes[b], i)
+                
+                block = blocks[b]
+                if end - i <= self.sorter.MIN_GALLOP:
+                    for value in islice(batch, i, end):
+                        insort(block, value)
+                else:
+                    mid = len(block)
+                    block.extend(islice(batch, i, end))
+                    if block[mid - 1] > block[mid]:
+                        self.sorter._galloping_merge(block, 0, mid, len(block))
+                maxes[b] = block[-1]
+                oversized = oversized or len(block) > limit
+                i = end
+                b += 1
+        
+        if oversized:
+            self._split_blocks()
+        self._offsets = [0] + list(accumulate(map(len, self._blocks)))
+    
+    def _split_blocks(self):
+        size = self.block_size
+        blocks, maxes = [], []
+        for block in self._blocks:
+            if len(block) > 2 * size:
+                for start in range(0, len(block), size):
+                    blocks.append(block[start:start + size])
+                    maxes.append(blocks[-1][-1])
+            else:
+                blocks.append(block)
+                maxes.append(block[-1])
+        
+        self._blocks, self._maxes = blocks, maxes
+    
+    def __len__(self) -> int:
+        return self._offsets[-1] + len(self._buffer)
+    
+    def __iter__(self):
+        self.flush()
+        for block in self._blocks:
+            yield from block
+    
+    def __getitem__(self, index: int) -> int:
+        self.flush()
+        size = self._offsets[-1]
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("SortedAccumulator index out of range")
+        
+        b = bisect_right(self._offsets, index) - 1
+        return self._blocks[b][index - self._offsets[b]]
+    
+    def __contains__(self, value: int) -> bool:
+        self.flush()
+        b = bisect_left(self._maxes, value)
+        return b < len(self._blocks) and self._blocks[b][bisect_left(self._blocks[b], value)] == value
+    
+    def rank(self, value: int) -> int:
+        self.flush()
+        b = bisect_left(self._maxes, value)
+        if b == len(self._blocks):
+            return self._offsets[-1]
+        return self._offsets[b] + bisect_left(self._blocks[b], value)
+    
+    def irange(self, minimum: Optional[int] = None, maximum: Optional[int] = None):
+        self.flush()
+        start = 0 if minimum is None else self.rank(minimum)
+        b = bisect_right(self._offsets, start) - 1
+        offset = start - self._offsets[b] if self._blocks else 0
+        for block in islice(self._blocks, b, None):
+            for value in islice(block, offset, None):
+                if maximum is not None and value > maximum:
+                    return
+                yield value
+            offset = 0
+
+
 def demonstrate_smart_sort():
     print("=" * 60)
     print("SmartSort - Adaptive Sorting Algorithm Demonstration")
@@ -0,0 +1,247 @@
+import json
+import math
+import time
+import random
+import argparse
+import platform
+from typing import List, Dict, Tuple, Callable, Any
+from smart_sort import SmartSort, InputCharacteristics
+from benchmark_smart_sort import SortingBenchmark
+
+
+class SmartSortTuner:
+    
+    INSERTION_THRESHOLDS = (4, 8, 12, 16, 20, 24, 32, 48, 64)
+    LEAF_WORKLOAD_SIZE = 4096
+    PRESORTED_SIZE = 1000
+    PRESORTED_WINDOWS = (2, 4, 8, 16, 32, 64, 128, 256, 512)
+    RADIX_SIZE = 5000
+    RADIX_RANGE_FACTORS = (1, 10, 100, 1000, 10**4, 10**5, 10**6, 10**8, 10**10)
+    CALIBRATION_SIZE = 8192
+    CALIBRATION_RUNS = 64
+    SHIFT_CALIBRATION_SIZE = 512
+    BUCKET_CALIBRATION_SIZE = 256
+    
+    def __init__(self, repeats: int = 5, verbose: bool = True):
+        self.repeats = repeats
+        self.verbose = verbose
+        self.benchmark = SortingBenchmark()
+        self.sorter = SmartSort(collect_stats="off", selection="rules")
+        for name in SmartSort.TUNABLE_PARAMETERS:
+            setattr(self.sorter, name, getattr(SmartSort, name))
+    
+    def _time(self, kernel: Callable[[List[int]], Any], data: List[int], batch: int = 1) -> float:
+        best = float("inf")
+        for _ in range(self.repeats):
+            copies = [data.copy() for _ in range(batch)]
+            start = time.perf_counter()
+            for copy in copies:
+                kernel(copy)
+            best = min(best, time.perf_counter() - start)
+        return best / batch
+    
+    def _with_parameter(self, name: str, value: Any, kernel: Callable[[List[int]], Any]):
+        def run(data: List[int]):
+            default = getattr(self.sorter, name)
+            setattr(self.sorter, name, value)
+            try:
+                return kernel(data)
+            finally:
+                setattr(self.sorter, name, default)
+        return run
+    
+    def _crossover(self, points: List[Tuple[Any, bool]], fallback: Any) -> Any:
+        best = fallback
+        for point, wins in points:
+            if not wins:
+                break
+            best = point
+        return best
+    
+    def _report(self, label: str, first: float, second: float):
+        if self.verbose:
+            winner = "<" if first <= second else ">"
+            print(f"  {label:>12}: {first*1e6:12.2f} us {winner} {second*1e6:12.2f} us")
+    
+    def tune_insertion_threshold(self) -> int:
+        if self.verbose:
+            print("\nINSERTION_THRESHOLD: leaf cutoff for merge sort and introsort")
+        
+        data = self.benchmark.generate_test_data(self.LEAF_WORKLOAD_SIZE, "random")
+        points = []
+        for threshold in self.INSERTION_THRESHOLDS:
+            merge = self._with_parameter(
+                "INSERTION_THRESHOLD", threshold,
+                lambda data: self.sorter._merge_sort(data, 0, len(data)))
+            introsort = self._with_parameter(
+                "INSERTION_THRESHOLD", threshold,
+                lambda data: self.sorter._introsort(data, 0, len(data)))
+            first, second = self._time(merge, data), self._time(introsort, data)
+            if self.verbose:
+                print(f"  {f'leaf={threshold}':>12}: merge {first*1e6:10.2f} us  "
+                      f"introsort {second*1e6:10.2f} us")
+            points.append((first + second, threshold))
+        return min(points)[1]
+    
+    def _block_shuffled(self, size: int, window: int) -> List[int]:
+        random.seed(window)
+        data = list(range(size))
+        for start in range(0, size, window):
+            block = data[start:start + window]
+            random.shuffle(block)
+            data[start:start + window] = block
+        return data
+    
+    def tune_presorted_threshold(self) -> float:
+        if self.verbose:
+            print("\nPRESORTED_THRESHOLD: insertion sort vs the next strategy in line")
+        
+        forced = self._with_parameter("PRESORTED_THRESHOLD", -1.0, self.sorter.sort)
+        skipped = self._with_parameter("PRESORTED_THRESHOLD", 2.0, self.sorter.sort)
+        points = []
+        for window in self.PRESORTED_WINDOWS:
+            data = self._block_shuffled(self.PRESORTED_SIZE, window)
+            presortedness = InputCharacteristics(data).presortedness
+            first, second = self._time(forced, data), self._time(skipped, data)
+            self._report(f"p={presortedness:.4f}", first, second)
+            points.append((presortedness, first <= second))
+        
+        points.sort(reverse=True)
+        return round(self._crossover(points, 1.0), 4)
+    
+    def tune_radix_thresholds(self) -> Tuple[int, float]:
+        if self.verbose:
+            print("\nRADIX_RANGE_FACTOR: radix sort vs introsort")
+        
+        size = self.RADIX_SIZE
+        radix = self.sorter._radix_sort
+        introsort = lambda data: self.sorter._introsort(data, 0, len(data))
+        points = []
+        densities = {}
+        for factor in self.RADIX_RANGE_FACTORS:
+            random.seed(factor)
+            data = [random.randint(0, size * factor) for _ in range(size)]
+            densities[factor] = InputCharacteristics(data).range_density
+            first, second = self._time(radix, data), self._time(introsort, data)
+            self._report(f"range={factor}n", first, second)
+            points.append((factor, first <= second))
+        
+        factor = self._crossover(points, self.RADIX_RANGE_FACTORS[0])
+        return factor, round(densities[factor], 6)
+    
+    def calibrate_cost_model(self) -> Dict[str, float]:
+        if self.verbose:
+            print("\nCOST_MODEL: seconds per modelled operation")
+        
+        n = self.CALIBRATION_SIZE
+        levels = math.log2(n)
+        sorter = self.sorter
+        random_data = self.benchmark.generate_test_data(n, "random")
+        ascending = list(range(n))
+        model = {}
+        
+        insertion = self._with_parameter(
+            "INSERTION_SHIFT_FACTOR", math.inf,
+            lambda data: sorter._bounded_insertion_sort(data, 0, len(data)))
+        model["insertion_element"] = self._time(insertion, ascending) / n
+        small = random_data[:self.SHIFT_CALIBRATION_SIZE]
+        inversions = InputCharacteristics(small).presortedness
+        inversions = (1 - inversions) * len(small) * (len(small) - 1) / 2
+        elapsed = self._time(insertion, small)
+        model["insertion_shift"] = max(0.0, elapsed - len(small) * model["insertion_element"]) / inversions
+        
+        model["merge_compare"] = self._time(
+            lambda data: sorter._merge_sort(data, 0, len(data)), random_data) / (n * levels)
+        model["introsort_compare"] = self._time(
+            lambda data: sorter._introsort(data, 0, len(data)), random_data) / (n * levels)
+        
+        model["run_scan"] = self._time(
+            lambda data: sorter._natural_merge_sort(data, 0, len(data)), ascending) / n
+        block = n // self.CALIBRATION_RUNS
+        blocks = [sorter.sort(random_data[i:i + block]) for i in range(0, n, block)]
+        runs = [value for chunk in blocks for value in chunk]
+        entropy = InputCharacteristics(runs).run_entropy
+        elapsed = self._time(lambda data: sorter._natural_merge_sort(data, 0, len(data)), runs)
+        model["run_merge"] = max(0.0, elapsed - n * model["run_scan"]) / (n * entropy)
+        
+        narrow = [value % 16 for value in random_data]
+        model["counting_element"] = self._time(lambda data: sorter._counting_sort(data, 0, 15),
+                                               narrow) / n
+        spread = [value * (4 * n // 16) for value in narrow]
+        elapsed = self._time(lambda data: sorter._counting_sort(data, 0, 4 * n), spread)
+        model["counting_value"] = max(0.0, elapsed - n * model["counting_element"]) / (4 * n)
+        permutation = self._block_shuffled(n, n)
+        elapsed = self._time(lambda data: sorter._counting_sort(data, 0, n - 1), permutation)
+        model["counting_distinct"] = max(
+            0.0, elapsed - n * (model["counting_element"] + model["counting_value"])) / n
+        
+        default_bits = sorter.radix_bits
+        try:
+            sorter.radix_bits = 8
+            elapsed = self._time(sorter._radix_sort, [value % 256 for value in random_data])
+            model["radix_element"] = elapsed / n
+            
+            sorter.radix_bits = 16
+            sparse = [value % 65536 for value in random_data[:self.BUCKET_CALIBRATION_SIZE]]
+            elapsed = self._time(sorter._radix_sort, sparse)
+            model["radix_bucket"] = max(0.0, elapsed - len(sparse) * model["radix_element"]) / 65536
+        finally:
+            sorter.radix_bits = default_bits
+        
+        model = {name: float(f"{value:.3g}") for name, value in model.items()}
+        if self.verbose:
+            for name, value in model.items():
+                print(f"  {name:>20}: {value:.3g} s")
+        return model
+    
+    def run(self) -> Dict[str, Any]:
+        factor, density = self.tune_radix_thresholds()
+        return {
+            "INSERTION_THRESHOLD": self.tune_insertion_threshold(),
+            "PRESORTED_THRESHOLD": self.tune_presorted_threshold(),
+            "RADIX_DENSITY_THRESHOLD": density,
+            "RADIX_RANGE_FACTOR": factor,
+            "COST_MODEL": self.calibrate_cost_model()
+        }
+    
+    def write_profile(self, parameters: Dict[str, Any], path: str):
+        profile = {
+            "version": 1,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "parameters": parameters
+        }
+        with open(path, "w") as stream:
+            json.dump(profile, stream, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="smartsort-tune",
+        description="Fit SmartSort strategy thresholds on this host and write a profile.")
+    parser.add_argument("-o", "--output", default=SmartSort.DEFAULT_PROFILE,
+                        help=f"profile path (default: {SmartSort.DEFAULT_PROFILE})")
+    parser.add_argument("-r", "--repeats", type=int, default=5,
+                        help="timing repeats per measurement, best is kept")
+    args = parser.parse_args()
+    
+    print("="*70)
+    print("SmartSort Autotuner")
+    print("="*70)
+    
+    tuner = SmartSortTuner(repeats=args.repeats)
+    parameters = tuner.run()
+    tuner.write_profile(parameters, args.output)
+    
+    print("\nFitted parameters:")
+    for name, value in parameters.items():
+        if name != "COST_MODEL":
+            print(f"  {name:24s} {getattr(SmartSort, name)!s:>8} -> {value}")
+    print(f"\nProfile written to {args.output}")
+    print(f"SmartSort loads it automatically; set {SmartSort.PROFILE_ENV} to use another path.")
+
+
+if __name__ == "__main__":
+    main()
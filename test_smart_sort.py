@@ -1,9 +1,54 @@
+import os
+import json
+import tempfile
 import unittest
+from itertools import islice
 import random
-from smart_sort import SmartSort, InputCharacteristics, SortStrategy
+from array import array
+from unittest import mock
+from smartsort_tune import SmartSortTuner
+from smart_sort import (SmartSort, ParallelSmartSort, ExternalSmartSort, SortedAccumulator, InputCharacteristics, SampledCharacteristics,
+                        ArrayCharacteristics, BlockSummary, SortStrategy, SORTING_NETWORKS)
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
-class TestInputCharacteristics(unittest.TestCase):
+
+class IsolatedTestCase(unittest.TestCase):
+    
+    def setUp(self):
+        workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(workdir.cleanup)
+        for patcher in (mock.patch.object(SmartSort, "DEFAULT_PROFILE",
+                                          os.path.join(workdir.name, "missing.json")),
+                        mock.patch.dict(os.environ)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        os.environ.pop(SmartSort.PROFILE_ENV, None)
+
+
+class KeyedItem:
+    
+    def __init__(self, key: int, index: int):
+        self.key = key
+        self.index = index
+    
+    def __lt__(self, other: "KeyedItem") -> bool:
+        return self.key < other.key
+    
+    def __le__(self, other: "KeyedItem") -> bool:
+        return self.key <= other.key
+    
+    def __gt__(self, other: "KeyedItem") -> bool:
+        return self.key > other.key
+    
+    def __ge__(self, other: "KeyedItem") -> bool:
+        return self.key >= other.key
+
+
+class TestInputCharacteristics(IsolatedTestCase):
     
     def test_presortedness_fully_sorted(self):
         data = [1, 2, 3, 4, 5]
@@ -44,11 +89,780 @@ class TestInputCharacteristics(unittest.TestCase):
         data = [1, 2, 3, 4, 5]
         chars = InputCharacteristics(data)
         self.assertFalse(chars.has_duplicates)
+    
+    def test_inversion_count_matches_pairwise(self):
+        random.seed(7)
+        for size in (2, 3, 17, 64, 101):
+            data = [random.randint(0, 20) for _ in range(size)]
+            expected = sum(1 for i in range(size) for j in range(i + 1, size)
+                           if data[i] > data[j])
+            chars = InputCharacteristics(data)
+            self.assertEqual(chars._count_inversions(data), expected)
+            max_inversions = size * (size - 1) // 2
+            self.assertAlmostEqual(chars.presortedness, 1 - expected / max_inversions)
+    
+    def test_runs_mode_presortedness(self):
+        self.assertEqual(InputCharacteristics([1, 2, 3, 4], "runs").presortedness, 1.0)
+        self.assertEqual(InputCharacteristics([4, 3, 2, 1], "runs").presortedness, 0.0)
+        chars = InputCharacteristics([1, 2, 3, 5, 4, 6, 7], "runs")
+        self.assertGreater(chars.presortedness, 0.7)
+    
+    def test_fused_features(self):
+        data = [3, 4, 5, 1, 2, 2, 9, 8, 7]
+        chars = InputCharacteristics(data)
+        self.assertEqual(chars.data_range, (1, 9))
+        self.assertEqual(chars.ascending_runs, 4)
+        self.assertEqual(chars.descending_runs, 5)
+        self.assertEqual(chars.unique_estimate, 8)
+        self.assertTrue(chars.has_duplicates)
+        self.assertEqual(sum(chars.histogram), len(data))
+    
+    def test_unique_estimate_sparse_range(self):
+        random.seed(13)
+        data = random.sample(range(10 ** 9), 5000)
+        chars = InputCharacteristics(data)
+        self.assertAlmostEqual(chars.unique_estimate, 5000, delta=100)
+        self.assertFalse(chars.has_duplicates)
+        
+        data = data[:2500] * 2
+        chars = InputCharacteristics(data)
+        self.assertAlmostEqual(chars.unique_estimate, 2500, delta=100)
+        self.assertTrue(chars.has_duplicates)
+    
+    def test_distribution_skew(self):
+        data = [1] * 30 + [2] * 30 + [3] * 30 + [1000] * 30
+        self.assertEqual(InputCharacteristics(data).distribution_type, "highly_skewed")
+        data = list(range(100))
+        self.assertEqual(InputCharacteristics(data).distribution_type, "normal")
+    
+    def test_features_are_lazy(self):
+        chars = InputCharacteristics([3, 1, 2])
+        self.assertIsNone(chars._presortedness)
+        self.assertIsNone(chars._unique_estimate)
+        self.assertEqual(chars.data_range, (1, 3))
+        self.assertIsNone(chars._unique_estimate)
+        self.assertAlmostEqual(chars.presortedness, 1 / 3)
+        self.assertIsNone(chars._histogram)
+        self.assertFalse(hasattr(chars, "__dict__"))
+    
+    def test_sorted_input_skips_inversion_count(self):
+        with mock.patch.object(InputCharacteristics, "_count_inversions",
+                               side_effect=AssertionError):
+            self.assertEqual(InputCharacteristics(list(range(1000))).presortedness, 1.0)
+            self.assertEqual(InputCharacteristics(list(range(1000, 0, -1))).presortedness, 0.0)
+    
+    def test_unknown_presortedness_mode(self):
+        with self.assertRaises(ValueError):
+            InputCharacteristics([1, 2, 3], "pairs")
+
+
+class TestSampledCharacteristics(IsolatedTestCase):
+    
+    def test_small_input_is_not_sampled(self):
+        data = [5, 2, 8, 1, 9, 3]
+        chars = SampledCharacteristics(data, budget=100)
+        full = InputCharacteristics(data)
+        self.assertFalse(chars.sampled)
+        self.assertEqual(chars.presortedness_error, 0.0)
+        self.assertEqual(chars.presortedness, full.presortedness)
+        self.assertEqual(chars.range_density, full.range_density)
+    
+    def test_sample_respects_budget(self):
+        data = list(range(10000))
+        chars = SampledCharacteristics(data, budget=256)
+        self.assertTrue(chars.sampled)
+        self.assertLessEqual(chars.sample_size, 256)
+        self.assertEqual(chars.size, 10000)
+        self.assertEqual(chars.data_range, (0, 9999))
+    
+    def test_presortedness_within_bound(self):
+        random.seed(11)
+        data = list(range(5000))
+        for _ in range(500):
+            i, j = random.randrange(5000), random.randrange(5000)
+            data[i], data[j] = data[j], data[i]
+        exact = InputCharacteristics(data).presortedness
+        chars = SampledCharacteristics(data, budget=512)
+        self.assertLessEqual(abs(chars.presortedness - exact), chars.presortedness_error)
+    
+    def test_duplicate_estimates(self):
+        random.seed(5)
+        few = [random.randint(0, 9) for _ in range(20000)]
+        chars = SampledCharacteristics(few, budget=500)
+        self.assertTrue(chars.has_duplicates)
+        self.assertEqual(chars.unique_estimate, 10)
+        self.assertEqual(chars.range_density, 1.0)
+        
+        distinct = random.sample(range(10 ** 7), 20000)
+        chars = SampledCharacteristics(distinct, budget=500)
+        self.assertFalse(chars.has_duplicates)
+    
+    def test_invalid_budget(self):
+        with self.assertRaises(ValueError):
+            SampledCharacteristics([1, 2, 3], budget=1)
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestArrayBackend(IsolatedTestCase):
+    
+    def setUp(self):
+        super().setUp()
+        self.sorter = SmartSort(verbose=False)
+        self.rng = np.random.default_rng(42)
+    
+    def test_characteristics_match_list_analysis(self):
+        for data in (self.rng.integers(-1000, 1000, size=777),
+                     self.rng.integers(0, 10 ** 12, size=500),
+                     np.arange(300)[::-1].copy(),
+                     np.full(50, 9)):
+            array_chars = ArrayCharacteristics(data)
+            list_chars = InputCharacteristics(data.tolist())
+            self.assertEqual(array_chars.data_range, list_chars.data_range)
+            self.assertEqual(array_chars.ascending_runs, list_chars.ascending_runs)
+            self.assertEqual(array_chars.descending_runs, list_chars.descending_runs)
+            self.assertAlmostEqual(array_chars.presortedness, list_chars.presortedness)
+            self.assertEqual(array_chars.unique_estimate, len(set(data.tolist())))
+    
+    def test_sort_returns_ndarray(self):
+        for data in (self.rng.integers(-10 ** 9, 10 ** 9, size=5000),
+                     self.rng.integers(0, 20, size=5000).astype(np.uint8),
+                     np.arange(1000)):
+            result = self.sorter.sort(data)
+            self.assertIsInstance(result, np.ndarray)
+            self.assertEqual(result.dtype, data.dtype)
+            self.assertTrue(np.array_equal(result, np.sort(data)))
+    
+    def test_dtype_extremes(self):
+        for dtype in (np.int8, np.int16, np.int32, np.int64, np.uint8, np.uint16, np.uint64):
+            info = np.iinfo(dtype)
+            for size in (300, 5000):
+                data = self.rng.integers(info.min, info.max, size=size, dtype=dtype, endpoint=True)
+                data[:2] = (info.max, info.min)
+                for selection in ("cost", "rules"):
+                    result = SmartSort(selection=selection).sort(data)
+                    self.assertEqual(result.dtype, data.dtype)
+                    self.assertTrue(np.array_equal(result, np.sort(data)))
+                chars = ArrayCharacteristics(data)
+                self.assertEqual(chars.unique_estimate, len(set(data.tolist())))
+    
+    def test_counting_path_for_small_range(self):
+        data = self.rng.integers(-5, 30, size=2000)
+        result = self.sorter.sort(data)
+        self.assertTrue(np.array_equal(result, np.sort(data)))
+        
+        strategies = [s["strategy"] for s in self.sorter.get_stats()["strategy_switches"]]
+        self.assertIn(SortStrategy.COUNTING_SORT.value, strategies)
+        self.assertEqual(self.sorter.sort_counts(data), self.sorter.sort_counts(data.tolist()))
+    
+    def test_original_array_unchanged(self):
+        data = self.rng.integers(0, 100, size=64)
+        original = data.copy()
+        self.sorter.sort(data)
+        self.assertTrue(np.array_equal(data, original))
+    
+    def test_rejects_non_integer_arrays(self):
+        with self.assertRaises(TypeError):
+            self.sorter.sort(np.array([1.5, 0.5, 2.0]))
+        with self.assertRaises(TypeError):
+            self.sorter.sort(np.zeros((3, 3), dtype=np.int64))
+
+
+class TestBufferSort(IsolatedTestCase):
+    
+    def setUp(self):
+        super().setUp()
+        self.sorter = SmartSort(verbose=False)
+        random.seed(23)
+    
+    def test_sorts_array_in_place(self):
+        for values in ([random.randint(-10 ** 9, 10 ** 9) for _ in range(3000)],
+                       [random.randint(0, 40) for _ in range(3000)],
+                       [random.randint(-300, 300) for _ in range(3000)],
+                       list(range(500, 0, -1))):
+            data = array("q", values)
+            result = self.sorter.sort_buffer(data)
+            self.assertIs(result, data)
+            self.assertEqual(data.tolist(), sorted(values))
+    
+    def test_sorts_read_only_buffer_into_out(self):
+        values = [random.randint(-2 ** 31, 2 ** 31 - 1) for _ in range(2000)]
+        source = memoryview(array("i", values).tobytes()).cast("i")
+        out = array("i", bytes(len(values) * 4))
+        result = self.sorter.sort_buffer(source, out=out)
+        self.assertIs(result, out)
+        self.assertEqual(out.tolist(), sorted(values))
+        self.assertEqual(source.tolist(), values)
+    
+    def test_sort_copies_buffer_inputs(self):
+        values = [random.randint(-10 ** 9, 10 ** 9) for _ in range(1000)]
+        source = array("q", values)
+        for data in (memoryview(source), memoryview(source.tobytes()).cast("q")):
+            result = self.sorter.sort(data)
+            self.assertIsInstance(result, array)
+            self.assertEqual(result.tolist(), sorted(values))
+            self.assertEqual(self.sorter.sort(data, reverse=True).tolist(), sorted(values, reverse=True))
+        self.assertEqual(source.tolist(), values)
+        
+        raw = bytes(random.randint(0, 255) for _ in range(500))
+        for data in (raw, bytearray(raw)):
+            self.assertEqual(self.sorter.sort(data).tolist(), sorted(raw))
+        
+        with self.assertRaises(TypeError):
+            self.sorter.sort(memoryview(array("d", [2.0, 1.0])))
+        with self.assertRaises(TypeError):
+            self.sorter.sort(memoryview(bytes(8)).cast("B", (2, 4)))
+    
+    def test_radix_and_counting_paths(self):
+        wide = array("q", (random.randint(-2 ** 20, 2 ** 20) for _ in range(5000)))
+        narrow = array("h", (random.randint(-8, 8) for _ in range(5000)))
+        for data, strategy in ((wide, SortStrategy.RADIX_SORT),
+                               (narrow, SortStrategy.COUNTING_SORT)):
+            expected = sorted(data)
+            self.sorter.sort_buffer(data)
+            self.assertEqual(data.tolist(), expected)
+            strategies = [s["strategy"] for s in self.sorter.get_stats()["strategy_switches"]]
+            self.assertIn(strategy.value, strategies)
+    
+    def test_sort_returns_new_array(self):
+        data = array("l", [5, 3, 9, 1, 7] * 10)
+        result = self.sorter.sort(data)
+        self.assertIsInstance(result, array)
+        self.assertEqual(result.tolist(), sorted(data))
+        self.assertEqual(data.tolist(), [5, 3, 9, 1, 7] * 10)
+    
+    def test_sampled_presorted_buffer_is_still_sorted(self):
+        values = list(range(10000))
+        values[1], values[2] = values[2], values[1]
+        data = array("q", values)
+        SmartSort(analysis_budget=100, selection="rules").sort_buffer(data)
+        self.assertEqual(data.tolist(), sorted(values))
+    
+    def test_rejects_bad_buffers(self):
+        with self.assertRaises(TypeError):
+            self.sorter.sort_buffer(array("d", [1.0, 0.5]))
+        with self.assertRaises(TypeError):
+            self.sorter.sort_buffer(bytes(16))
+        with self.assertRaises(ValueError):
+            self.sorter.sort_buffer(array("q", [2, 1]), out=array("i", [0, 0]))
 
 
-class TestSmartSort(unittest.TestCase):
+class TestKeyedSort(IsolatedTestCase):
     
     def setUp(self):
+        super().setUp()
+        self.sorter = SmartSort(verbose=False)
+        random.seed(29)
+    
+    def _strategies(self):
+        return [s["strategy"] for s in self.sorter.get_stats()["strategy_switches"]]
+    
+    def test_integer_key_uses_counting_and_is_stable(self):
+        records = [{"id": i, "group": random.randint(0, 9)} for i in range(500)]
+        result = self.sorter.sort(records, key=lambda r: r["group"])
+        self.assertEqual(result, sorted(records, key=lambda r: r["group"]))
+        self.assertIn(SortStrategy.COUNTING_SORT.value, self._strategies())
+    
+    def test_integer_key_uses_radix_and_is_stable(self):
+        records = [(random.randint(-2 ** 20, 2 ** 20), i) for i in range(5000)]
+        records += [(records[i][0], 5000 + i) for i in range(0, 5000, 7)]
+        result = self.sorter.sort(records, key=lambda r: r[0])
+        self.assertEqual(result, sorted(records, key=lambda r: r[0]))
+        self.assertIn(SortStrategy.RADIX_SORT.value, self._strategies())
+    
+    def test_reverse_is_stable(self):
+        records = [(random.randint(0, 5), i) for i in range(300)]
+        for key in (lambda r: r[0], lambda r: str(r[0])):
+            result = self.sorter.sort(records, key=key, reverse=True)
+            self.assertEqual(result, sorted(records, key=key, reverse=True))
+    
+    def test_non_integer_keys(self):
+        words = ["pear", "fig", "apple", "kiwi", "banana", "date"] * 20
+        result = self.sorter.sort(words, key=len)
+        self.assertEqual(result, sorted(words, key=len))
+        result = self.sorter.sort(words, key=str.upper)
+        self.assertEqual(result, sorted(words, key=str.upper))
+    
+    def test_key_called_once_per_element(self):
+        calls = []
+        
+        def key(value):
+            calls.append(value)
+            return -value
+        
+        data = [random.randint(0, 10 ** 6) for _ in range(400)]
+        result = self.sorter.sort(data, key=key)
+        self.assertEqual(result, sorted(data, key=lambda v: -v))
+        self.assertEqual(len(calls), len(data))
+    
+    def test_huge_integer_keys(self):
+        data = [random.randint(-2 ** 80, 2 ** 80) for _ in range(300)]
+        self.assertEqual(self.sorter.sort(data, key=lambda v: v), sorted(data))
+    
+    def test_typed_inputs_keep_their_container(self):
+        values = [random.randint(-10 ** 6, 10 ** 6) for _ in range(500)]
+        data = array("q", values)
+        result = self.sorter.sort(data, reverse=True)
+        self.assertIsInstance(result, array)
+        self.assertEqual(result.typecode, "q")
+        self.assertEqual(result.tolist(), sorted(values, reverse=True))
+        result = self.sorter.sort(data, key=abs)
+        self.assertIsInstance(result, array)
+        self.assertEqual(result.tolist(), sorted(values, key=abs))
+        self.assertEqual(data.tolist(), values)
+        
+        if np is not None:
+            data = np.array(values, dtype=np.int32)
+            result = self.sorter.sort(data, reverse=True)
+            self.assertIsInstance(result, np.ndarray)
+            self.assertEqual(result.dtype, np.int32)
+            self.assertEqual(result.tolist(), sorted(values, reverse=True))
+            result = self.sorter.sort(data, key=abs)
+            self.assertIsInstance(result, np.ndarray)
+            self.assertEqual(result.dtype, np.int32)
+            self.assertEqual(result.tolist(), sorted(values, key=abs))
+    
+    def test_sort_inplace(self):
+        data = [random.randint(-100, 100) for _ in range(200)]
+        expected = sorted(data, reverse=True)
+        alias = data
+        self.assertIsNone(self.sorter.sort_inplace(data, reverse=True))
+        self.assertIs(alias, data)
+        self.assertEqual(data, expected)
+
+
+class TestParallelSort(IsolatedTestCase):
+    
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.object(ParallelSmartSort, "PARALLEL_THRESHOLD", 1000)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.sorter = ParallelSmartSort(workers=2)
+    
+    def test_parallel_matches_sorted(self):
+        for data in ([random.randint(-10**12, 10**12) for _ in range(5000)],
+                     [random.randint(0, 3) for _ in range(5000)],
+                     list(range(5000, 0, -1))):
+            self.assertEqual(self.sorter.sort(data), sorted(data))
+    
+    def test_parallel_stats_cover_all_chunks(self):
+        data = [random.randint(0, 10**9) for _ in range(4000)]
+        self.sorter.sort(data)
+        stats = self.sorter.get_stats()
+        
+        self.assertGreater(stats["comparisons"], 0)
+        chunk_ranges = [switch["range"] for switch in stats["strategy_switches"]
+                        if switch["strategy"] != SortStrategy.NATURAL_MERGE.value]
+        self.assertIn((0, 2000), chunk_ranges)
+        self.assertIn((2000, 4000), chunk_ranges)
+    
+    def test_parallel_falls_back_for_wide_integers(self):
+        data = [random.randint(0, 2**70) for _ in range(2000)]
+        self.assertEqual(self.sorter.sort(data), sorted(data))
+    
+    def test_small_inputs_stay_serial(self):
+        data = [5, 2, 8, 1, 9]
+        with mock.patch.object(ParallelSmartSort, "_parallel_sort") as parallel:
+            self.assertEqual(self.sorter.sort(data), [1, 2, 5, 8, 9])
+        parallel.assert_not_called()
+    
+    def test_invalid_worker_count(self):
+        with self.assertRaises(ValueError):
+            ParallelSmartSort(workers=0)
+
+
+class TestExternalSort(IsolatedTestCase):
+    
+    def setUp(self):
+        super().setUp()
+        workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(workdir.cleanup)
+        self.input_path = os.path.join(workdir.name, "input.bin")
+        self.output_path = os.path.join(workdir.name, "output.bin")
+    
+    def write_input(self, values, typecode="q"):
+        with open(self.input_path, "wb") as stream:
+            array(typecode, values).tofile(stream)
+    
+    def read_output(self, typecode="q"):
+        result = array(typecode)
+        with open(self.output_path, "rb") as stream:
+            result.frombytes(stream.read())
+        return result.tolist()
+    
+    def test_multi_pass_merge(self):
+        data = [random.randint(-10**12, 10**12) for _ in range(20000)]
+        self.write_input(data)
+        sorter = ExternalSmartSort(memory_budget=8 * 1024, max_open_files=3)
+        
+        self.assertEqual(sorter.sort_file(self.input_path, self.output_path), len(data))
+        self.assertEqual(self.read_output(), sorted(data))
+        stats = sorter.get_stats()
+        self.assertEqual(stats["runs"], 20)
+        self.assertGreater(stats["merge_passes"], 1)
+    
+    def test_single_run_and_narrow_typecode(self):
+        data = [random.randint(0, 50) for _ in range(3000)]
+        self.write_input(data, "i")
+        sorter = ExternalSmartSort(typecode="i")
+        
+        sorter.sort_file(self.input_path, self.output_path)
+        self.assertEqual(self.read_output("i"), sorted(data))
+        self.assertEqual(sorter.get_stats()["merge_passes"], 0)
+    
+    def test_sampled_presorted_chunks_are_sorted(self):
+        data = list(range(20000))
+        data[1], data[2] = data[2], data[1]
+        self.write_input(data)
+        sorter = ExternalSmartSort(memory_budget=80000, analysis_budget=100, selection="rules")
+        sorter.sort_file(self.input_path, self.output_path)
+        self.assertEqual(self.read_output(), sorted(data))
+    
+    def test_chunks_leave_room_for_scratch_copies(self):
+        budget = 1 << 20
+        for options, copies in (({}, 3), ({"presortedness_mode": "runs"}, 2),
+                                ({"analysis_budget": 4096}, 2)):
+            sorter = ExternalSmartSort(memory_budget=budget, **options)
+            self.assertLessEqual(sorter.chunk_items * sorter.itemsize * copies, budget)
+    
+    def test_empty_file(self):
+        self.write_input([])
+        self.assertEqual(ExternalSmartSort().sort_file(self.input_path, self.output_path), 0)
+        self.assertEqual(self.read_output(), [])
+    
+    def test_rejects_truncated_file(self):
+        with open(self.input_path, "wb") as stream:
+            stream.write(b"\x00" * 12)
+        with self.assertRaises(ValueError):
+            ExternalSmartSort().sort_file(self.input_path, self.output_path)
+    
+    def test_invalid_configuration(self):
+        with self.assertRaises(ValueError):
+            ExternalSmartSort(max_open_files=1)
+        with self.assertRaises(ValueError):
+            ExternalSmartSort(typecode="d")
+
+
+class TestSelection(IsolatedTestCase):
+    
+    def setUp(self):
+        super().setUp()
+        self.sorter = SmartSort()
+    
+    def strategy_used(self):
+        return self.sorter.get_stats()["strategy_switches"][0]["strategy"]
+    
+    def test_selection_matches_sorted(self):
+        datasets = [
+            [random.randint(-10**9, 10**9) for _ in range(2000)],
+            [random.randint(0, 300) for _ in range(2000)],
+            [random.randint(0, 3) * 10**6 for _ in range(2000)],
+            list(range(2000)),
+            list(range(2000, 0, -1))
+        ]
+        for data in datasets:
+            expected = sorted(data)
+            for k in (0, 1, 17, 500, 1999, 2000, 2500):
+                self.assertEqual(self.sorter.topk(data, k), expected[:k])
+                partial = self.sorter.partial_sort(data, k)
+                self.assertEqual(partial[:k], expected[:k])
+                self.assertEqual(sorted(partial), expected)
+            for nth in (0, 1, 999, 1999):
+                self.assertEqual(self.sorter.select(data, nth), expected[nth])
+    
+    def test_selection_strategies(self):
+        dense = [random.randint(0, 100) for _ in range(5000)]
+        self.sorter.topk(dense, 10)
+        self.assertEqual(self.strategy_used(), SortStrategy.COUNTING_SELECT.value)
+        
+        sparse = [random.randint(0, 10**12) for _ in range(5000)]
+        self.sorter.topk(sparse, 10)
+        self.assertEqual(self.strategy_used(), SortStrategy.HEAP_SELECT.value)
+        
+        self.sorter.select(sparse, 2500)
+        self.assertEqual(self.strategy_used(), SortStrategy.INTROSELECT.value)
+    
+    def test_selection_does_not_modify_input(self):
+        data = [random.randint(0, 10**12) for _ in range(1000)]
+        original = data.copy()
+        self.sorter.partial_sort(data, 500)
+        self.sorter.select(data, 500)
+        self.assertEqual(data, original)
+    
+    def test_iter_sorted_matches_sorted(self):
+        datasets = [
+            [],
+            [7],
+            [random.randint(-10**9, 10**9) for _ in range(3000)],
+            [random.randint(0, 200) for _ in range(3000)],
+            [random.randint(0, 3) * 10**6 for _ in range(3000)],
+            list(range(3000)),
+            list(range(3000, 0, -1))
+        ]
+        for data in datasets:
+            self.assertEqual(list(self.sorter.iter_sorted(data)), sorted(data))
+    
+    def test_iter_sorted_confirms_sampled_presortedness(self):
+        data = list(range(10000))
+        data[1], data[2] = data[2], data[1]
+        self.assertEqual(list(SmartSort(analysis_budget=100).iter_sorted(data)), sorted(data))
+        self.assertEqual(list(SmartSort(analysis_budget=100).iter_sorted(sorted(data))),
+                         sorted(data))
+    
+    def test_iter_sorted_is_lazy(self):
+        data = [random.randint(0, 10**12) for _ in range(20000)]
+        with mock.patch.object(SmartSort, "_small_sort",
+                               side_effect=SmartSort._small_sort,
+                               autospec=True) as leaves:
+            first_page = list(islice(self.sorter.iter_sorted(data), 10))
+        
+        self.assertEqual(first_page, sorted(data)[:10])
+        self.assertLessEqual(leaves.call_count, 2)
+        self.assertEqual(self.strategy_used(), SortStrategy.QUICK_SORT.value)
+    
+    def test_iter_sorted_bounds_partitioning_depth(self):
+        data = [random.randint(0, 10**12) for _ in range(5000)]
+        worst_pivot = lambda data, lo, hi: max(range(lo, hi), key=data.__getitem__)
+        with mock.patch.object(self.sorter, "_choose_pivot", side_effect=worst_pivot), \
+                mock.patch.object(SmartSort, "_partition", side_effect=SmartSort._partition,
+                                  autospec=True) as partitions:
+            first_page = list(islice(self.sorter.iter_sorted(data), 10))
+            self.assertEqual(first_page, sorted(data)[:10])
+            self.assertLessEqual(partitions.call_count, 2 * len(data).bit_length())
+            self.assertEqual(list(self.sorter.iter_sorted(data)), sorted(data))
+    
+    def test_resort_applies_delta(self):
+        base = sorted(random.randint(0, 500) for _ in range(2000))
+        deletes = random.sample(base, 300)
+        inserts = [random.randint(-50, 550) for _ in range(400)]
+        
+        expected = list(base)
+        for value in deletes:
+            expected.remove(value)
+        expected = sorted(expected + inserts)
+        
+        self.assertEqual(self.sorter.resort(base, inserts, deletes), expected)
+        self.assertEqual(self.sorter.resort(base, inserts), sorted(base + inserts))
+        self.assertEqual(self.sorter.resort([], inserts), sorted(inserts))
+        self.assertEqual(self.sorter.resort(base), base)
+    
+    def test_resort_skips_full_analysis(self):
+        base = list(range(0, 100000, 2))
+        inserts = [random.randrange(1, 100000, 2) for _ in range(50)]
+        with mock.patch.object(SmartSort, "_analyze", side_effect=SmartSort._analyze,
+                               autospec=True) as analyze:
+            result = self.sorter.resort(base, inserts)
+        
+        self.assertEqual(result, sorted(base + inserts))
+        self.assertTrue(all(len(call.args[1]) <= len(inserts) for call in analyze.call_args_list))
+    
+    def test_resort_missing_delete(self):
+        with self.assertRaises(ValueError):
+            self.sorter.resort([1, 2, 3], deletes=[2, 2])
+    
+    def test_merge_sorted_matches_sorted(self):
+        for count in (0, 1, 2, 3, 8, 13):
+            shards = [sorted(random.randint(0, 50) for _ in range(random.randint(0, 60)))
+                      for _ in range(count)]
+            expected = sorted(value for shard in shards for value in shard)
+            self.assertEqual(list(self.sorter.merge_sorted(shards)), expected)
+            self.assertEqual(list(self.sorter.merge_sorted(iter(shard) for shard in shards)),
+                             expected)
+            self.assertEqual(self.sorter.merge_sorted(shards, collect=True), expected)
+    
+    def test_merge_sorted_is_stable_with_key(self):
+        for count in (2, 5):
+            shards = [[KeyedItem(random.randint(0, 10), (source, i)) for i in range(40)]
+                      for source in range(count)]
+            for shard in shards:
+                shard.sort(key=lambda item: item.key)
+            
+            expected = sorted((item for shard in shards for item in shard),
+                              key=lambda item: item.key)
+            for collect in (False, True):
+                merged = self.sorter.merge_sorted(shards, key=lambda item: item.key,
+                                                  collect=collect)
+                self.assertEqual([item.index for item in merged],
+                                 [item.index for item in expected])
+    
+    def test_merge_sorted_streams_and_collects_with_one_engine(self):
+        sorter = SmartSort(collect_stats="trace")
+        for count, kernel in ((2, "merge"), (3, "heap_merge"), (64, "heap_merge")):
+            shards = [sorted(random.randint(0, 10 ** 6) for _ in range(50)) for _ in range(count)]
+            kernels = []
+            for collect in (False, True):
+                merged = list(sorter.merge_sorted(shards, collect=collect))
+                self.assertEqual(merged, sorted(value for shard in shards for value in shard))
+                kernels.append([event["kernel"] for event in sorter.stats["trace"]])
+            self.assertEqual(kernels, [[kernel], [kernel]])
+    
+    def test_merge_sorted_streams_lazily(self):
+        def shard(start):
+            for value in range(start, 10**9, 3):
+                yield value
+        
+        merged = self.sorter.merge_sorted([shard(0), shard(1), shard(2)])
+        self.assertEqual(list(islice(merged, 10)), list(range(10)))
+    
+    def test_invalid_selection_arguments(self):
+        with self.assertRaises(ValueError):
+            self.sorter.topk([3, 1, 2], -1)
+        with self.assertRaises(ValueError):
+            self.sorter.partial_sort([3, 1, 2], -1)
+        with self.assertRaises(IndexError):
+            self.sorter.select([3, 1, 2], 3)
+        with self.assertRaises(IndexError):
+            self.sorter.select([], 0)
+
+
+class TestSortedAccumulator(IsolatedTestCase):
+    
+    def test_sorted_view_while_streaming(self):
+        accumulator = SortedAccumulator(buffer_size=16, block_size=8)
+        reference = []
+        for _ in range(40):
+            batch = [random.randint(-500, 500) for _ in range(random.randint(0, 50))]
+            if random.random() < 0.5:
+                accumulator.update(batch)
+            else:
+                for value in batch:
+                    accumulator.add(value)
+            reference = sorted(reference + batch)
+            
+            self.assertEqual(len(accumulator), len(reference))
+            self.assertEqual(list(accumulator), reference)
+        
+        self.assertGreater(len(accumulator._blocks), 1)
+        self.assertTrue(all(len(block) <= 16 for block in accumulator._blocks))
+    
+    def test_rank_index_and_membership(self):
+        accumulator = SortedAccumulator(buffer_size=10, block_size=4)
+        values = [random.randint(0, 100) for _ in range(300)]
+        accumulator.update(values)
+        reference = sorted(values)
+        
+        for probe in (-1, 0, 37, 50, 100, 101):
+            self.assertEqual(accumulator.rank(probe), sum(v < probe for v in reference))
+            self.assertEqual(probe in accumulator, probe in reference)
+        for index in (0, 1, 150, 299, -1, -300):
+            self.assertEqual(accumulator[index], reference[index])
+        with self.assertRaises(IndexError):
+            accumulator[300]
+    
+    def test_irange(self):
+        accumulator = SortedAccumulator(buffer_size=7, block_size=5)
+        values = [random.randint(0, 1000) for _ in range(500)]
+        accumulator.update(values)
+        reference = sorted(values)
+        
+        self.assertEqual(list(accumulator.irange()), reference)
+        self.assertEqual(list(accumulator.irange(200, 400)),
+                         [v for v in reference if 200 <= v <= 400])
+        self.assertEqual(list(accumulator.irange(minimum=990)), [v for v in reference if v >= 990])
+        self.assertEqual(list(accumulator.irange(maximum=-1)), [])
+        self.assertEqual(list(SortedAccumulator().irange(0, 10)), [])
+    
+    def test_buffer_stays_bounded(self):
+        accumulator = SortedAccumulator(buffer_size=32)
+        for value in range(1000, 0, -1):
+            accumulator.add(value)
+            self.assertLess(len(accumulator._buffer), 32)
+        self.assertEqual(list(accumulator), list(range(1, 1001)))
+
+
+class TestTuningProfile(IsolatedTestCase):
+    
+    def setUp(self):
+        super().setUp()
+        workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(workdir.cleanup)
+        self.path = os.path.join(workdir.name, "profile.json")
+    
+    def write_profile(self, parameters):
+        with open(self.path, "w") as stream:
+            json.dump({"version": 1, "parameters": parameters}, stream)
+    
+    def test_profile_overrides_defaults(self):
+        self.write_profile({"INSERTION_THRESHOLD": 8, "PRESORTED_THRESHOLD": 0.99,
+                            "RADIX_RANGE_FACTOR": 1000})
+        sorter = SmartSort(profile=self.path)
+        
+        self.assertEqual(sorter.profile, self.path)
+        self.assertEqual(sorter.INSERTION_THRESHOLD, 8)
+        self.assertEqual(sorter.PRESORTED_THRESHOLD, 0.99)
+        self.assertEqual(sorter.RADIX_RANGE_FACTOR, 1000)
+        self.assertEqual(sorter.RADIX_DENSITY_THRESHOLD, SmartSort.RADIX_DENSITY_THRESHOLD)
+        self.assertEqual(SmartSort.INSERTION_THRESHOLD, 20)
+        
+        data = [random.randint(0, 10**6) for _ in range(500)]
+        self.assertEqual(sorter.sort(data), sorted(data))
+    
+    def test_profile_from_environment(self):
+        self.write_profile({"INSERTION_THRESHOLD": 12})
+        with mock.patch.dict(os.environ, {SmartSort.PROFILE_ENV: self.path}):
+            sorter = SmartSort()
+        self.assertEqual(sorter.INSERTION_THRESHOLD, 12)
+    
+    def test_missing_default_profile_keeps_defaults(self):
+        with mock.patch.object(SmartSort, "DEFAULT_PROFILE", self.path), \
+                mock.patch.dict(os.environ, clear=True):
+            sorter = SmartSort()
+        self.assertIsNone(sorter.profile)
+        self.assertEqual(sorter.INSERTION_THRESHOLD, SmartSort.INSERTION_THRESHOLD)
+    
+    def test_unknown_parameter_rejected(self):
+        self.write_profile({"MIN_GALLOP": 3})
+        with self.assertRaises(ValueError):
+            SmartSort(profile=self.path)
+    
+    def test_tuner_writes_loadable_profile(self):
+        tuner = SmartSortTuner(repeats=1, verbose=False)
+        tuner.INSERTION_THRESHOLDS = (8, 16)
+        tuner.LEAF_WORKLOAD_SIZE = 256
+        tuner.PRESORTED_SIZE = 200
+        tuner.PRESORTED_WINDOWS = (2, 64)
+        tuner.RADIX_SIZE = 500
+        tuner.RADIX_RANGE_FACTORS = (1, 100)
+        
+        parameters = tuner.run()
+        self.assertEqual(set(parameters), set(SmartSort.TUNABLE_PARAMETERS))
+        tuner.write_profile(parameters, self.path)
+        
+        sorter = SmartSort(profile=self.path)
+        for name, value in parameters.items():
+            self.assertEqual(getattr(sorter, name), value)
+    
+    def test_calibration_times_the_bounded_insertion_kernel(self):
+        tuner = SmartSortTuner(repeats=1, verbose=False)
+        tuner.CALIBRATION_SIZE = 2048
+        sorter = tuner.sorter
+        bounded = sorter._bounded_insertion_sort
+        factors = []
+        
+        def record(data, left, right):
+            factors.append(sorter.INSERTION_SHIFT_FACTOR)
+            return bounded(data, left, right)
+        
+        with mock.patch.object(sorter, "_bounded_insertion_sort", side_effect=record):
+            model = tuner.calibrate_cost_model()
+        self.assertTrue(factors)
+        self.assertTrue(all(factor == float("inf") for factor in factors))
+        self.assertGreater(model["insertion_shift"], 0)
+    
+    def test_tuner_threshold_fits_change_the_selected_strategy(self):
+        tuner = SmartSortTuner(repeats=1, verbose=False)
+        data = tuner._block_shuffled(200, 2)
+        chosen = []
+        for value in (-1.0, 2.0):
+            tuner.sorter.PRESORTED_THRESHOLD = value
+            chosen.append(tuner.sorter._select_strategy(InputCharacteristics(data)))
+        self.assertNotEqual(chosen[0], chosen[1])
+
+
+class TestSmartSort(IsolatedTestCase):
+    
+    def setUp(self):
+        super().setUp()
         self.sorter = SmartSort(verbose=False)
     
     def test_empty_array(self):
@@ -114,6 +928,42 @@ class TestSmartSort(unittest.TestCase):
         self.sorter.sort(data_copy)
         self.assertEqual(original, [5, 2, 8, 1, 9])
     
+    def test_runs_presortedness_mode(self):
+        sorter = SmartSort(presortedness_mode="runs")
+        random.seed(3)
+        data = [random.randint(-500, 500) for _ in range(300)]
+        self.assertEqual(sorter.sort(data), sorted(data))
+    
+    def test_selector_skips_unused_features(self):
+        chars = InputCharacteristics([5, 2, 8, 1, 9])
+        self.sorter._select_strategy(chars)
+        self.assertIsNone(chars._presortedness)
+        
+        chars = InputCharacteristics(list(range(100)))
+        self.sorter._select_strategy(chars)
+        self.assertIsNone(chars._histogram)
+        self.assertIsNone(chars._distribution_type)
+    
+    def test_analysis_budget(self):
+        sorter = SmartSort(analysis_budget=64)
+        random.seed(9)
+        for data in ([random.randint(-1000, 1000) for _ in range(2000)],
+                     [random.randint(0, 50) for _ in range(2000)],
+                     list(range(2000))):
+            self.assertEqual(sorter.sort(data), sorted(data))
+    
+    def test_sampled_runs_are_scaled_to_the_input(self):
+        random.seed(10)
+        data = [random.randint(0, 10**9) for _ in range(20000)]
+        sorter = SmartSort(analysis_budget=500, selection="rules")
+        self.assertEqual(sorter.sort(data), sorted(data))
+        self.assertNotEqual(sorter.get_stats()["strategy_switches"][0]["strategy"],
+                            SortStrategy.NATURAL_MERGE.value)
+        
+        chars = SampledCharacteristics(data, budget=500)
+        self.assertNotEqual(SmartSort(selection="rules")._select_strategy(chars),
+                            SortStrategy.NATURAL_MERGE)
+    
     def test_statistics_tracking(self):
         data = [5, 2, 8, 1, 9]
         self.sorter.sort(data)
@@ -125,11 +975,93 @@ class TestSmartSort(unittest.TestCase):
         self.assertIn("execution_time", stats)
         self.assertGreater(stats["comparisons"], 0)
         self.assertGreater(len(stats["strategy_switches"]), 0)
+    
+    def test_stats_off_sorts_without_counting(self):
+        sorter = SmartSort(collect_stats="off")
+        for data in ([5, 2, 8, 1, 9], [random.randint(-10**6, 10**6) for _ in range(3000)],
+                     list(range(500, 0, -1))):
+            self.assertEqual(sorter.sort(data), sorted(data))
+            stats = sorter.get_stats()
+            self.assertEqual(stats["comparisons"], 0)
+            self.assertEqual(stats["swaps"], 0)
+            self.assertGreater(len(stats["strategy_switches"]), 0)
+            self.assertNotIn("trace", stats)
+    
+    def test_stats_trace_matches_counters(self):
+        data = [random.randint(0, 10**9) for _ in range(3000)]
+        counters = SmartSort(collect_stats="counters")
+        tracer = SmartSort(collect_stats="trace")
+        self.assertEqual(tracer.sort(data), sorted(data))
+        counters.sort(data)
+        
+        stats = tracer.get_stats()
+        self.assertGreater(len(stats["trace"]), 0)
+        self.assertEqual(sum(event["comparisons"] for event in stats["trace"]),
+                         stats["comparisons"])
+        self.assertEqual(stats["comparisons"], counters.get_stats()["comparisons"])
+        self.assertEqual(stats["swaps"], counters.get_stats()["swaps"])
+    
+    def test_sorting_networks_sort_every_zero_one_input(self):
+        for stats in ("off", "counters"):
+            sorter = SmartSort(collect_stats=stats)
+            sorter._reset_stats()
+            for size, comparators in SORTING_NETWORKS.items():
+                for mask in range(1 << size):
+                    bits = [(mask >> i) & 1 for i in range(size)]
+                    data = [-1] + bits + [2]
+                    sorter._small_sort(data, 1, size + 1)
+                    self.assertEqual(data, [-1] + sorted(bits) + [2])
+            if stats == "counters":
+                comparisons = sum(len(comparators) << size
+                                  for size, comparators in SORTING_NETWORKS.items())
+                self.assertEqual(sorter.stats["comparisons"], comparisons)
+    
+    def test_small_sort_uses_insertion_below_networks(self):
+        sorter = SmartSort(collect_stats="trace")
+        sorter._reset_stats()
+        for size in range(2, SmartSort.NETWORK_MIN_SIZE):
+            for mask in range(1 << size):
+                bits = [(mask >> i) & 1 for i in range(size)]
+                data = [-1] + bits + [2]
+                sorter._small_sort(data, 1, size + 1)
+                self.assertEqual(data, [-1] + sorted(bits) + [2])
+        self.assertEqual({event["kernel"] for event in sorter.stats["trace"]}, {"insertion"})
+    
+    def test_small_sort_uses_binary_insertion_above_networks(self):
+        random.seed(37)
+        sorter = SmartSort(collect_stats="trace")
+        sorter._reset_stats()
+        for size in range(SmartSort.NETWORK_MAX_SIZE + 1, 3 * SmartSort.INSERTION_THRESHOLD):
+            data = [random.randint(0, 5) for _ in range(size + 6)]
+            expected = data[:3] + sorted(data[3:-3]) + data[-3:]
+            sorter._small_sort(data, 3, size + 3)
+            self.assertEqual(data, expected)
+        self.assertEqual({event["kernel"] for event in sorter.stats["trace"]}, {"binary_insertion"})
+        
+        values = [random.randint(-100, 100) for _ in range(15)]
+        buffer = array("q", values)
+        sorter._small_sort(memoryview(buffer), 0, len(values))
+        self.assertEqual(list(buffer), sorted(values))
+    
+    def test_leaves_use_network_and_binary_insertion_kernels(self):
+        random.seed(41)
+        data = [random.randint(-10 ** 12, 10 ** 12) for _ in range(3000)]
+        sorter = SmartSort(collect_stats="trace")
+        for kernel in (sorter._merge_sort, sorter._introsort):
+            sorter._reset_stats()
+            self.assertEqual(kernel(list(data), 0, len(data)), sorted(data))
+            kernels = {event["kernel"] for event in sorter.stats["trace"]}
+            self.assertTrue(kernels & {"network", "binary_insertion"})
+    
+    def test_invalid_stats_mode(self):
+        with self.assertRaises(ValueError):
+            SmartSort(collect_stats="verbose")
 
 
-class TestAdaptiveStrategy(unittest.TestCase):
+class TestAdaptiveStrategy(IsolatedTestCase):
     
     def setUp(self):
+        super().setUp()
         self.sorter = SmartSort(verbose=False)
     
     def test_insertion_sort_for_small_array(self):
@@ -148,27 +1080,355 @@ class TestAdaptiveStrategy(unittest.TestCase):
         strategies = [s["strategy"] for s in stats["strategy_switches"]]
         self.assertIn(SortStrategy.INSERTION_SORT.value, strategies)
     
-    def test_radix_sort_for_dense_range(self):
+    def test_counting_sort_for_dense_range(self):
         data = [5, 2, 8, 1, 9, 3, 7, 4, 6, 0] * 5
         self.sorter.sort(data)
         stats = self.sorter.get_stats()
         
         strategies = [s["strategy"] for s in stats["strategy_switches"]]
+        self.assertIn(SortStrategy.COUNTING_SORT.value, strategies)
+    
+    def test_counting_sort_for_few_unique(self):
+        random.seed(16)
+        data = [random.randint(-20, 40) for _ in range(1000)]
+        result = self.sorter.sort(data)
+        self.assertEqual(result, sorted(data))
+        
+        strategies = [s["strategy"] for s in self.sorter.get_stats()["strategy_switches"]]
+        self.assertIn(SortStrategy.COUNTING_SORT.value, strategies)
+    
+    def test_sort_counts(self):
+        data = [3, -1, 3, 7, 3, -1, 100]
+        self.assertEqual(self.sorter.sort_counts(data),
+                         [(-1, 2), (3, 3), (7, 1), (100, 1)])
+        self.assertEqual(self.sorter.sort_counts([4, 4, 5]), [(4, 2), (5, 1)])
+        self.assertEqual(self.sorter.sort_counts([]), [])
+    
+    def test_radix_sort_for_dense_range(self):
+        random.seed(12)
+        data = [random.randint(0, 1000) for _ in range(300)]
+        sorter = SmartSort(selection="rules")
+        result = sorter.sort(data)
+        self.assertEqual(result, sorted(data))
+        
+        strategies = [s["strategy"] for s in sorter.get_stats()["strategy_switches"]]
+        self.assertIn(SortStrategy.RADIX_SORT.value, strategies)
+    
+    def test_cost_model_radix_for_moderate_range(self):
+        random.seed(12)
+        data = [random.randint(0, 10**6) for _ in range(5000)]
+        result = self.sorter.sort(data)
+        self.assertEqual(result, sorted(data))
+        
+        strategies = [s["strategy"] for s in self.sorter.get_stats()["strategy_switches"]]
         self.assertIn(SortStrategy.RADIX_SORT.value, strategies)
     
+    def test_natural_merge_for_reverse_sorted(self):
+        data = list(range(500, 0, -1))
+        result = self.sorter.sort(data)
+        self.assertEqual(result, sorted(data))
+        
+        strategies = [s["strategy"] for s in self.sorter.get_stats()["strategy_switches"]]
+        self.assertIn(SortStrategy.NATURAL_MERGE.value, strategies)
+    
+    def test_natural_merge_for_append_mostly(self):
+        random.seed(21)
+        data = list(range(2000)) + [random.randint(0, 2000) for _ in range(30)]
+        result = self.sorter.sort(data)
+        self.assertEqual(result, sorted(data))
+        
+        strategies = [s["strategy"] for s in self.sorter.get_stats()["strategy_switches"]]
+        self.assertIn(SortStrategy.NATURAL_MERGE.value, strategies)
+    
+    def test_natural_merge_is_stable(self):
+        random.seed(4)
+        records = []
+        for _ in range(6):
+            run = sorted(random.randint(0, 15) for _ in range(random.randint(10, 90)))
+            records.extend(run if random.random() < 0.5 else run[::-1])
+        keyed = [KeyedItem(value, index) for index, value in enumerate(records)]
+        self.sorter._natural_merge_sort(keyed, 0, len(keyed))
+        self.assertEqual([(item.key, item.index) for item in keyed],
+                         sorted((item.key, item.index) for item in keyed))
+    
+    def test_merge_sort_is_stable(self):
+        random.seed(6)
+        keyed = [KeyedItem(random.randint(0, 9), index) for index in range(333)]
+        self.sorter._merge_sort(keyed, 0, len(keyed))
+        self.assertEqual([(item.key, item.index) for item in keyed],
+                         sorted((item.key, item.index) for item in keyed))
+    
+    def test_merge_sort_subrange(self):
+        random.seed(8)
+        data = [random.randint(0, 1000) for _ in range(200)]
+        expected = data[:30] + sorted(data[30:170]) + data[170:]
+        self.sorter._merge_sort(data, 30, 170)
+        self.assertEqual(data, expected)
+    
+    def test_radix_sort_for_negative_dense_range(self):
+        random.seed(12)
+        data = [random.randint(-1000, 1000) for _ in range(300)]
+        result = self.sorter.sort(data)
+        self.assertEqual(result, sorted(data))
+        
+        strategies = [s["strategy"] for s in self.sorter.get_stats()["strategy_switches"]]
+        self.assertIn(SortStrategy.RADIX_SORT.value, strategies)
+    
+    def test_radix_sort_for_wide_signed_keys(self):
+        random.seed(14)
+        data = [random.randint(-2 ** 20, 2 ** 20) for _ in range(5000)]
+        result = self.sorter.sort(data)
+        self.assertEqual(result, sorted(data))
+        
+        strategies = [s["strategy"] for s in self.sorter.get_stats()["strategy_switches"]]
+        self.assertIn(SortStrategy.RADIX_SORT.value, strategies)
+    
+    def test_radix_digit_widths(self):
+        random.seed(15)
+        data = [random.randint(-2 ** 40, 2 ** 40) for _ in range(500)]
+        for bits in SmartSort.RADIX_DIGIT_BITS:
+            sorter = SmartSort(radix_bits=bits)
+            self.assertEqual(sorter._radix_sort(list(data)), sorted(data))
+        with self.assertRaises(ValueError):
+            SmartSort(radix_bits=10)
+    
+    def test_radix_skips_constant_digits(self):
+        data = [value << 16 for value in (7, 3, 250, 1, 99)] * 4
+        sorter = SmartSort(radix_bits=8)
+        self.assertEqual(sorter._radix_sort(list(data)), sorted(data))
+        self.assertEqual(sorter.get_stats()["swaps"], len(data))
+    
+    def test_cost_model_picks_cheapest_candidate(self):
+        random.seed(21)
+        datasets = [
+            list(range(2000)) + [random.randint(0, 2000) for _ in range(30)],
+            [random.randint(0, 50) for _ in range(2000)],
+            [random.randint(-10 ** 12, 10 ** 12) for _ in range(3000)]
+        ]
+        for data in datasets:
+            chars = InputCharacteristics(data)
+            costs = self.sorter._predict_costs(chars)
+            self.assertEqual(self.sorter._select_strategy(chars), min(costs, key=costs.get))
+            self.assertTrue(all(cost > 0 for cost in costs.values()))
+    
+    def test_cost_model_avoids_quadratic_insertion(self):
+        random.seed(22)
+        data = list(range(3000))
+        for _ in range(300):
+            i, j = random.randrange(3000), random.randrange(3000)
+            data[i], data[j] = data[j], data[i]
+        chars = InputCharacteristics(data)
+        self.assertGreaterEqual(chars.presortedness, SmartSort.PRESORTED_THRESHOLD)
+        
+        self.assertEqual(SmartSort(selection="rules")._select_strategy(chars),
+                         SortStrategy.INSERTION_SORT)
+        self.assertNotEqual(self.sorter._select_strategy(chars), SortStrategy.INSERTION_SORT)
+    
+    def test_cost_model_skips_inversion_count_on_random_input(self):
+        random.seed(24)
+        with mock.patch.object(InputCharacteristics, "_count_inversions",
+                               side_effect=AssertionError):
+            for size in (100, 1000, 10000):
+                data = [random.randint(0, 10 ** 9) for _ in range(size)]
+                self.assertEqual(SmartSort().sort(data), sorted(data))
+        
+        original = InputCharacteristics._count_inversions
+        
+        def sample_only(chars, data):
+            self.assertLessEqual(len(data), SmartSort.INSERTION_SAMPLE_SIZE)
+            return original(chars, data)
+        
+        data = [random.randint(0, 10 ** 9) for _ in range(20000)]
+        runs = sorted(data[:10000]) + sorted(data[10000:])
+        with mock.patch.object(InputCharacteristics, "_count_inversions", sample_only):
+            self.assertEqual(SmartSort().sort(runs), sorted(data))
+        
+        data = list(range(3000))
+        data[100], data[2000] = data[2000], data[100]
+        self.assertIn(SortStrategy.INSERTION_SORT,
+                      self.sorter._predict_costs(InputCharacteristics(data)))
+    
+    def test_prediction_exposed_in_stats(self):
+        data = [random.randint(0, 10**9) for _ in range(1000)]
+        self.sorter.sort(data)
+        stats = self.sorter.get_stats()
+        
+        strategy = stats["strategy_switches"][0]["strategy"]
+        self.assertEqual(stats["predicted_time"], stats["predicted_costs"][strategy])
+        self.assertEqual(stats["predicted_time"], min(stats["predicted_costs"].values()))
+        self.assertGreater(stats["actual_time"], 0)
+        self.assertAlmostEqual(stats["prediction_ratio"],
+                               stats["actual_time"] / stats["predicted_time"])
+    
+    def test_cost_model_constants_from_profile(self):
+        with tempfile.TemporaryDirectory() as workdir:
+            path = os.path.join(workdir, "profile.json")
+            with open(path, "w") as stream:
+                json.dump({"parameters": {"COST_MODEL": {"radix_element": 1.0}}}, stream)
+            sorter = SmartSort(profile=path)
+        
+        self.assertEqual(sorter.COST_MODEL["radix_element"], 1.0)
+        self.assertEqual(sorter.COST_MODEL["merge_compare"], SmartSort.COST_MODEL["merge_compare"])
+        data = [random.randint(0, 10**6) for _ in range(5000)]
+        sorter.sort(data)
+        strategies = [s["strategy"] for s in sorter.get_stats()["strategy_switches"]]
+        self.assertNotIn(SortStrategy.RADIX_SORT.value, strategies)
+    
+    def test_invalid_selection_mode(self):
+        with self.assertRaises(ValueError):
+            SmartSort(selection="fastest")
+    
+    def _mixed_input(self, size: int) -> list:
+        random.seed(23)
+        third = size // 3
+        return (list(range(third)) +
+                [random.randint(0, 500) for _ in range(third)] +
+                [random.randint(0, 10 ** 12) for _ in range(size - 2 * third)])
+    
+    def test_mixed_input_gets_per_segment_strategies(self):
+        data = self._mixed_input(60000)
+        result = self.sorter.sort(data)
+        self.assertEqual(result, sorted(data))
+        
+        segments = self.sorter.stats["strategy_switches"][1:]
+        self.assertGreaterEqual(len({event["strategy"] for event in segments}), 2)
+        bounds = sorted(event["range"] for event in segments)
+        self.assertEqual(bounds[0][0], 0)
+        self.assertEqual(bounds[-1][1], len(data))
+        for (_, stop), (start, _) in zip(bounds, bounds[1:]):
+            self.assertEqual(stop, start)
+    
+    def test_segment_analysis_respects_budget(self):
+        data = self._mixed_input(60000)
+        sorter = SmartSort()
+        sorter.SEGMENT_ANALYSIS_FACTOR = 3
+        self.assertEqual(sorter.sort(data), sorted(data))
+        self.assertGreater(sorter.stats["analyzed_elements"], 0)
+        self.assertLessEqual(sorter.stats["analyzed_elements"], 3 * len(data))
+        
+        sorter.SEGMENT_ANALYSIS_FACTOR = 0
+        self.assertEqual(sorter.sort(data), sorted(data))
+        self.assertEqual(sorter.stats["analyzed_elements"], 0)
+        self.assertEqual(len(sorter.stats["strategy_switches"]), 1)
+    
+    def test_uniform_input_is_not_split(self):
+        random.seed(29)
+        data = [random.randint(0, 10 ** 9) for _ in range(20000)]
+        self.assertEqual(self.sorter.sort(data), sorted(data))
+        self.assertEqual(len(self.sorter.stats["strategy_switches"]), 1)
+        self.assertLess(self.sorter.stats["analyzed_elements"], len(data) + SmartSort.SEGMENT_BLOCKS)
+    
+    def test_segment_statistics_match_exact_analysis(self):
+        data = self._mixed_input(5000)
+        summary = BlockSummary(data, 0, len(data), 64)
+        for left, right in [(0, 1600), (1600, 3392), (640, 5000), (0, 5000)]:
+            segment = summary.segment(left, right)
+            exact = InputCharacteristics(data[left:right])
+            self.assertEqual(segment.data_range, exact.data_range)
+            self.assertEqual(segment.ascending_runs, exact.ascending_runs)
+            self.assertEqual(segment.descending_runs, exact.descending_runs)
+    
+    def test_subrange_adaptive_sort_leaves_rest_untouched(self):
+        data = self._mixed_input(30000)
+        expected = data[:100] + sorted(data[100:-100]) + data[-100:]
+        self.sorter._reset_stats()
+        self.sorter._adaptive_sort(data, 100, len(data) - 100, None)
+        self.assertEqual(data, expected)
+    
+    def _noisy_ramp(self, size: int) -> list:
+        random.seed(31)
+        return [i + random.randint(0, 9 * size // 10) for i in range(size)]
+    
+    def test_insertion_bails_out_on_adversarial_input(self):
+        data = self._noisy_ramp(4000)
+        sorter = SmartSort(selection="rules", collect_stats="trace")
+        result = sorter.sort(data)
+        self.assertEqual(result, sorted(data))
+        
+        stats = sorter.get_stats()
+        self.assertEqual(stats["strategy_switches"][0]["strategy"], "InsertionSort")
+        self.assertEqual(stats["strategy_switches"][1]["strategy"], "NaturalMergeSort")
+        self.assertEqual(stats["insertion_bailouts"], 1)
+        budget = SmartSort.INSERTION_SHIFT_FACTOR * len(data) * len(data).bit_length()
+        shifts = sum(event["swaps"] for event in stats["trace"] if event["kernel"] == "insertion")
+        self.assertLessEqual(shifts, budget + len(data))
+    
+    def test_insertion_within_budget_runs_to_completion(self):
+        data = list(range(5000))
+        for i in range(0, 5000, 10):
+            data[i], data[i + 1] = data[i + 1], data[i]
+        sorter = SmartSort(selection="rules")
+        self.assertEqual(sorter.sort(data), sorted(data))
+        self.assertEqual(sorter.stats["strategy_switches"][0]["strategy"], "InsertionSort")
+        self.assertEqual(sorter.stats["insertion_bailouts"], 0)
+    
+    def test_insertion_bailout_on_misestimated_presortedness(self):
+        data = list(range(1000, 5000)) + list(range(1000))
+        sorter = SmartSort(presortedness_mode="runs")
+        self.assertEqual(sorter.sort(data), sorted(data))
+        self.assertEqual(sorter.stats["insertion_bailouts"], 1)
+    
+    def test_insertion_bailout_for_buffers_and_keys(self):
+        data = self._noisy_ramp(3000)
+        sorter = SmartSort(selection="rules")
+        buffer = array("q", data)
+        sorter.sort_buffer(buffer)
+        self.assertEqual(list(buffer), sorted(data))
+        self.assertEqual(sorter.stats["insertion_bailouts"], 1)
+        
+        items = [KeyedItem(value // 7, index) for index, value in enumerate(data)]
+        result = sorter.sort(items, key=lambda item: item.key)
+        self.assertEqual([(item.key, item.index) for item in result],
+                         sorted((item.key, item.index) for item in items))
+    
+    def test_hybrid_for_large_sparse_random(self):
+        random.seed(17)
+        data = [random.randint(-10 ** 12, 10 ** 12) for _ in range(3000)]
+        result = self.sorter.sort(data)
+        self.assertEqual(result, sorted(data))
+        
+        strategies = [s["strategy"] for s in self.sorter.get_stats()["strategy_switches"]]
+        self.assertIn(SortStrategy.HYBRID.value, strategies)
+    
+    def test_introsort_heavy_duplicates_and_subrange(self):
+        random.seed(18)
+        data = [random.randint(0, 3) for _ in range(1500)]
+        expected = data[:100] + sorted(data[100:1400]) + data[1400:]
+        self.sorter._introsort(data, 100, 1400)
+        self.assertEqual(data, expected)
+    
+    def test_introsort_adversarial_patterns(self):
+        size = 2000
+        patterns = [
+            list(range(size)),
+            list(range(size, 0, -1)),
+            list(range(size // 2)) + list(range(size // 2, 0, -1)),
+            [i % 7 for i in range(size)],
+        ]
+        for data in patterns:
+            result = self.sorter._introsort(list(data), 0, size)
+            self.assertEqual(result, sorted(data))
+    
+    def test_heap_sort_fallback(self):
+        random.seed(19)
+        data = [random.randint(0, 50) for _ in range(300)]
+        self.assertEqual(self.sorter._heap_sort(list(data), 0, len(data)), sorted(data))
+    
     def test_merge_sort_for_random_large(self):
         random.seed(42)
         data = [random.randint(1, 10000) for _ in range(100)]
-        self.sorter.sort(data)
-        stats = self.sorter.get_stats()
+        sorter = SmartSort(selection="rules")
+        sorter.sort(data)
+        stats = sorter.get_stats()
         
         strategies = [s["strategy"] for s in stats["strategy_switches"]]
         self.assertIn(SortStrategy.MERGE_SORT.value, strategies)
 
 
-class TestEdgeCases(unittest.TestCase):
+class TestEdgeCases(IsolatedTestCase):
     
     def setUp(self):
+        super().setUp()
         self.sorter = SmartSort(verbose=False)
     
     def test_all_same_elements(self):
@@ -202,9 +1462,10 @@ class TestEdgeCases(unittest.TestCase):
         self.assertEqual(result, expected)
 
 
-class TestPerformance(unittest.TestCase):
+class TestPerformance(IsolatedTestCase):
     
     def setUp(self):
+        super().setUp()
         self.sorter = SmartSort(verbose=False)
     
     def test_performance_random_1000(self):
@@ -239,6 +1500,15 @@ def run_tests():
     suite = unittest.TestSuite()
     
     suite.addTests(loader.loadTestsFromTestCase(TestInputCharacteristics))
+    suite.addTests(loader.loadTestsFromTestCase(TestSampledCharacteristics))
+    suite.addTests(loader.loadTestsFromTestCase(TestArrayBackend))
+    suite.addTests(loader.loadTestsFromTestCase(TestBufferSort))
+    suite.addTests(loader.loadTestsFromTestCase(TestKeyedSort))
+    suite.addTests(loader.loadTestsFromTestCase(TestParallelSort))
+    suite.addTests(loader.loadTestsFromTestCase(TestExternalSort))
+    suite.addTests(loader.loadTestsFromTestCase(TestSelection))
+    suite.addTests(loader.loadTestsFromTestCase(TestSortedAccumulator))
+    suite.addTests(loader.loadTestsFromTestCase(TestTuningProfile))
     suite.addTests(loader.loadTestsFromTestCase(TestSmartSort))
     suite.addTests(loader.loadTestsFromTestCase(TestAdaptiveStrategy))
     suite.addTests(loader.loadTestsFromTestCase(TestEdgeCases))